@@ -1,10 +1,11 @@
 import os
 import logging
+import threading
 import streamlit as st
 from datetime import datetime
 
-from src.agents.scheduling_agent import SchedulingAgent
-from src.utils.database import initialize_database
+from src.agents.scheduling_agent import SchedulingAgent, StreamReplacement
+from src.utils.database import ensure_schema, has_seed_data
 from src.utils.generate_data import generate_synthetic_data
 
 # Configure logging
@@ -17,12 +18,97 @@ logger = logging.getLogger(__name__)
 # Initialize database and synthetic data if needed
 def initialize_data():
     """Initialize database and synthetic data if needed"""
-    db_initialized = initialize_database()
-    if db_initialized:
-        # Check if we need to generate synthetic data
-        # In a real app, you would check if data already exists
+    ensure_schema()
+    # Seeding runs in one transaction, so any seed data means a complete earlier run
+    if not has_seed_data():
         generate_synthetic_data(num_patients=50, num_days=30)
-    return db_initialized
+    return True
+
+def run_data_initialization(status: dict) -> None:
+    """Run initialize_data, recording any failure in status for the UI to report"""
+    try:
+        initialize_data()
+    except Exception as e:
+        logger.exception("Data initialization failed")
+        status["error"] = e
+
+@st.cache_resource
+def start_data_initialization() -> dict:
+    """Initialize data in the background, once per process, so the UI renders immediately"""
+    status = {"error": None}
+    status["thread"] = threading.Thread(target=run_data_initialization, args=(status,), daemon=True)
+    status["thread"].start()
+    return status
+
+# Shown when background data initialization fails
+DATA_ERROR_MESSAGE = "Data setup failed, so appointments can't be scheduled right now. Check app.log and restart the app."
+
+# Characters that signal a message may need the markdown renderer
+MARKDOWN_CHARS = "*_`#["
+
+@st.cache_data
+def render_md(content: str) -> str:
+    """Cache markdown content so unchanged messages short-circuit on rerun"""
+    return content
+
+def has_markdown(content: str) -> bool:
+    """Check whether a message contains any markdown syntax"""
+    return any(c in content for c in MARKDOWN_CHARS)
+
+def render_message(content: str, markdown: bool = None) -> None:
+    """Render a chat message, skipping the markdown pipeline for plain text"""
+    if markdown is None:
+        markdown = has_markdown(content)
+    if markdown:
+        st.markdown(render_md(content))
+    else:
+        st.text(content)
+
+def split_complete_blocks(text: str) -> tuple:
+    """Split text into (stable prefix ending at the last block boundary, trailing block)"""
+    end = text.rfind("\n\n")
+    if end == -1:
+        return "", text
+    end += 2
+    # Never split inside an open code fence
+    while text.count("```", 0, end) % 2:
+        end = text.rfind("```", 0, end)
+        end = text.rfind("\n\n", 0, end)
+        if end == -1:
+            return "", text
+        end += 2
+    return text[:end], text[end:]
+
+def stream_response(chunks) -> str:
+    """Render streamed chunks, parsing markdown only for the still-growing trailing block"""
+    blocks_placeholder = st.empty()
+    blocks_container = blocks_placeholder.container()
+    trailing_placeholder = st.empty()
+    text = ""
+    rendered = 0
+    for chunk in chunks:
+        if isinstance(chunk, StreamReplacement):
+            # Start over with the replacement text, clearing the blocks already rendered
+            blocks_container = blocks_placeholder.container()
+            text = str(chunk)
+            rendered = 0
+        else:
+            text += chunk
+        stable, trailing = split_complete_blocks(text)
+        # Completed blocks are rendered once and never re-parsed
+        if len(stable) > rendered:
+            blocks_container.markdown(stable[rendered:])
+            rendered = len(stable)
+        trailing_placeholder.markdown(trailing)
+    return text
+
+def add_message(role: str, content: str) -> None:
+    """Append a message to the chat history with its render mode precomputed"""
+    st.session_state.messages.append({
+        "role": role,
+        "content": content,
+        "markdown": has_markdown(content)
+    })
 
 # Initialize the scheduling agent
 def get_agent():
@@ -41,10 +127,13 @@ def main():
     
     st.title("Medical Appointment Scheduler")
     
-    # Initialize data
-    if 'initialized' not in st.session_state:
-        with st.spinner("Initializing database and synthetic data..."):
-            st.session_state.initialized = initialize_data()
+    # Initialize data off the first-paint path
+    data_status = start_data_initialization()
+    data_thread = data_status["thread"]
+    if data_thread.is_alive():
+        st.sidebar.info("Loading data...")
+    elif data_status["error"]:
+        st.error(DATA_ERROR_MESSAGE)
     
     # Sidebar
     st.sidebar.title("About")
@@ -65,29 +154,39 @@ def main():
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    # Display chat messages (render mode was decided once, when each message was added)
+    history_container = st.container()
+    with history_container:
+        for message in st.session_state.messages:
+            with st.chat_message(message["role"]):
+                render_message(message["content"], message.get("markdown"))
     
     # Chat input
     if prompt := st.chat_input("How can I help you schedule your appointment today?"):
         # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        add_message("user", prompt)
         
         # Display user message
-        with st.chat_message("user"):
-            st.markdown(prompt)
+        with history_container:
+            with st.chat_message("user"):
+                render_message(prompt)
         
         # Get agent response
-        with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                agent = get_agent()
-                response = agent.process_message(prompt)
-                st.markdown(response)
+        with history_container:
+            with st.chat_message("assistant"):
+                # The agent's tools need the database, so wait for initialization
+                if data_thread.is_alive():
+                    with st.spinner("Finishing data setup..."):
+                        data_thread.join()
+                if data_status["error"]:
+                    st.error(DATA_ERROR_MESSAGE)
+                    response = DATA_ERROR_MESSAGE
+                else:
+                    agent = get_agent()
+                    response = stream_response(agent.process_message_stream(prompt))
         
         # Add assistant response to chat history
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        add_message("assistant", response)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,17 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 import os
+import re
 import json
+import hashlib
+import queue
+import time
 import logging
+import threading
+from collections import deque, OrderedDict
 from datetime import datetime
 
+import httpx
+from tenacity import retry_if_exception
 from langchain.agents import AgentExecutor
 from langchain.agents.format_scratchpad import format_to_openai_function_messages
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
@@ -12,75 +20,232 @@ from langchain.tools import BaseTool
 from langchain.schema import SystemMessage, HumanMessage
 from langchain_mistralai import ChatMistralAI
 from langchain_core.messages import AIMessage
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.retry import RunnableRetry
 
 from src.config import MISTRAL_API_KEY
 from src.agents.tools import get_scheduling_tools
 
 logger = logging.getLogger(__name__)
 
+ERROR_RESPONSE = "I'm sorry, I encountered an error while processing your request. Please try again."
+
+# Mistral HTTP settings: pooled keep-alive connections and retries for transient failures
+MISTRAL_API_BASE = "https://api.mistral.ai/v1"
+HTTP_TIMEOUT = 30.0  # seconds
+LLM_MAX_ATTEMPTS = 3
+
+def _is_transient_llm_error(error: BaseException) -> bool:
+    """Transport failures, rate limits and server errors can succeed on retry; other 4xx errors cannot"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+class _TransientErrorRetry(RunnableRetry):
+    """RunnableRetry that only retries errors for which _is_transient_llm_error holds"""
+    
+    @property
+    def _kwargs_retrying(self) -> Dict[str, Any]:
+        kwargs = super()._kwargs_retrying
+        kwargs["retry"] = retry_if_exception(_is_transient_llm_error)
+        return kwargs
+
+# Informational responses cached per (prompt, patient info, recent history)
+RESPONSE_CACHE_SIZE = 256
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _get_cached_response(key: str) -> Optional[str]:
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+def _cache_response(key: str, result: Dict[str, Any]) -> None:
+    """Cache a response only if the agent answered without calling any tools"""
+    if result.get("intermediate_steps"):
+        return
+    with _response_cache_lock:
+        _response_cache[key] = result["output"]
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+# System prompt for the scheduling agent
+SYSTEM_PROMPT = """
+You are a medical appointment scheduling assistant for a healthcare clinic. 
+Your job is to help patients schedule appointments with doctors, collect necessary information, 
+and ensure all paperwork is properly handled.
+
+Follow these guidelines:
+1. Be professional, friendly, and empathetic in all interactions
+2. Collect patient information accurately (name, DOB, contact details)
+3. For new patients, schedule 60-minute appointments; for returning patients, schedule 30-minute appointments
+4. Always verify insurance information
+5. Send confirmation and intake forms after booking
+6. Set up reminders for the appointment
+7. Export appointment details for admin review when complete
+
+IMPORTANT: Always maintain patient privacy and handle all information securely.
+"""
+
+# The prompt template and input mapping have a fixed shape, so they are built once at import
+_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="chat_history"),
+    HumanMessage(content="{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+_PROMPT_PIPELINE = {
+    "input": lambda x: x["input"],
+    "chat_history": lambda x: x["chat_history"],
+    "agent_scratchpad": lambda x: format_to_openai_function_messages(
+        x["intermediate_steps"]
+    ),
+} | _PROMPT
+
+# Upper bound on agent runs in flight across all Streamlit sessions, to avoid 429s
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_SLOT_TIMEOUT = 30.0  # seconds to wait for a free slot before replying BUSY_RESPONSE
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+BUSY_RESPONSE = "We're helping a lot of patients right now. Please try again in a moment."
+
+# Chat messages sent to the LLM as history (6 user/assistant turns)
+MAX_HISTORY_MESSAGES = 12
+
+# Patterns for extracting patient details from free text
+_NAME_RE = re.compile(r"name is\s+([A-Za-z][A-Za-z'-]*)[\s,]+([A-Za-z][A-Za-z'-]*)", re.I)
+_DOB_RE = re.compile(r"\b(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}/\d{4}|\d{4}/\d{1,2}/\d{1,2})\b")
+_DOB_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d")
+_DOB_KEYS = ("born on", "dob", "date of birth")
+_PATIENT_INFO_KEYWORDS = ("name", "born", "dob", "birth")
+_MIN_PATIENT_INFO_LENGTH = 10
+_DOCTOR_RE = re.compile(r"doctor(?:\s+id)?\s*#?\s*(\d+)", re.I)
+_SLOT_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(?:at\s+)?(\d{1,2}:\d{2})")
+# Direct booking needs an explicit request to book, with nothing suggesting another intent
+_BOOKING_INTENT_RE = re.compile(r"\b(?:book|schedule)\b", re.I)
+_NON_BOOKING_INTENT_RE = re.compile(
+    r"\b(?:cancel\w*|reschedul\w*|move|change|availab\w*|free|open|don'?t|not)\b", re.I
+)
+
+# Streaming settings: batch tokens so the UI re-renders at most ~20 times per second
+STREAM_FLUSH_INTERVAL = 0.05  # seconds
+STREAM_FLUSH_CHARS = 16
+
+def _normalize_dob(text: str) -> Optional[str]:
+    """Parse a date of birth into the YYYY-MM-DD form patients are stored and looked up with"""
+    for date_format in _DOB_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+class StreamReplacement(str):
+    """A streamed chunk that replaces all text yielded before it, rather than extending it"""
+
+# Queued when the tokens streamed so far will not be part of the final answer
+_STREAM_RESET = object()
+
+class _TokenQueueHandler(BaseCallbackHandler):
+    """Callback handler that pushes streamed LLM tokens onto a queue"""
+    
+    def __init__(self, token_queue: queue.Queue):
+        self.token_queue = token_queue
+    
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token:
+            self.token_queue.put(token)
+    
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        # A failed attempt's partial output is dropped; a retry streams its own
+        self.token_queue.put(_STREAM_RESET)
+    
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        # The generation led to a tool call, so its text was not the answer
+        self.token_queue.put(_STREAM_RESET)
+
 class SchedulingAgent:
     """Medical appointment scheduling agent using LangChain and MistralAI"""
     
+    # LLM and the prompt | LLM | parser pipeline built on it, created once and shared by all instances
+    _llm = None
+    _agent_pipeline = None
+    _init_lock = threading.Lock()
+    
+    # HTTP client shared by all instances so TLS sessions are reused across calls
+    _http_client = None
+    
     def __init__(self):
         """Initialize the scheduling agent with LLM and tools"""
         self.llm = self._init_llm()
         self.tools = get_scheduling_tools()
+        self.tools_by_name = {tool.name: tool for tool in self.tools}
         self.agent_executor = self._setup_agent()
-        self.messages = []
+        self.messages = deque(maxlen=MAX_HISTORY_MESSAGES)
         self.patient_info = {}
     
     def _init_llm(self) -> ChatMistralAI:
-        """Initialize the Mistral LLM"""
-        return ChatMistralAI(
-            model="mistral-large-latest",
-            mistral_api_key=MISTRAL_API_KEY,
-            temperature=0.2,
-            max_tokens=1024
+        """Initialize the Mistral LLM, shared by all instances"""
+        with SchedulingAgent._init_lock:
+            if SchedulingAgent._llm is None:
+                SchedulingAgent._http_client = httpx.Client(
+                    base_url=MISTRAL_API_BASE,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Accept": "application/json",
+                        "Authorization": f"Bearer {MISTRAL_API_KEY}"
+                    },
+                    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+                    timeout=HTTP_TIMEOUT
+                )
+                
+                SchedulingAgent._llm = ChatMistralAI(
+                    model="mistral-large-latest",
+                    mistral_api_key=MISTRAL_API_KEY,
+                    temperature=0.2,
+                    max_tokens=1024,
+                    streaming=True,
+                    timeout=int(HTTP_TIMEOUT),
+                    # Retries are handled by _with_retry; a second layer would multiply attempts
+                    max_retries=0,
+                    client=SchedulingAgent._http_client
+                )
+                SchedulingAgent._agent_pipeline = (
+                    _PROMPT_PIPELINE | self._with_retry(SchedulingAgent._llm) | OpenAIFunctionsAgentOutputParser()
+                )
+            return SchedulingAgent._llm
+    
+    @staticmethod
+    def _with_retry(llm: ChatMistralAI):
+        """Retry individual LLM calls on transient HTTP errors (transport, 429/5xx) with jittered backoff"""
+        # Retrying the LLM call rather than the whole agent run avoids re-running tools.
+        # RunnableRetry only wraps invoke/batch, so the executor must not call .stream() (see _setup_agent)
+        return _TransientErrorRetry(
+            bound=llm,
+            kwargs={},
+            config={},
+            wait_exponential_jitter=True,
+            max_attempt_number=LLM_MAX_ATTEMPTS
         )
     
     def _setup_agent(self) -> AgentExecutor:
         """Set up the LangChain agent with tools and prompt"""
-        # System prompt for the scheduling agent
-        system_prompt = """
-        You are a medical appointment scheduling assistant for a healthcare clinic. 
-        Your job is to help patients schedule appointments with doctors, collect necessary information, 
-        and ensure all paperwork is properly handled.
-        
-        Follow these guidelines:
-        1. Be professional, friendly, and empathetic in all interactions
-        2. Collect patient information accurately (name, DOB, contact details)
-        3. For new patients, schedule 60-minute appointments; for returning patients, schedule 30-minute appointments
-        4. Always verify insurance information
-        5. Send confirmation and intake forms after booking
-        6. Set up reminders for the appointment
-        7. Export appointment details for admin review when complete
-        
-        IMPORTANT: Always maintain patient privacy and handle all information securely.
-        """
-        
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            HumanMessage(content="{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad")
-        ])
-        
-        # Create the agent
-        agent = {
-            "input": lambda x: x["input"],
-            "chat_history": lambda x: x["chat_history"],
-            "agent_scratchpad": lambda x: format_to_openai_function_messages(
-                x["intermediate_steps"]
-            ),
-        } | prompt | self.llm | OpenAIFunctionsAgentOutputParser()
-        
         return AgentExecutor(
-            agent=agent,
+            agent=SchedulingAgent._agent_pipeline,
             tools=self.tools,
             verbose=True,
             handle_parsing_errors=True,
             max_iterations=10,
-            early_stopping_method="generate"
+            early_stopping_method="generate",
+            return_intermediate_steps=True,
+            # Invoke the pipeline so retries apply; tokens still stream through the callbacks
+            # because the LLM is built with streaming=True
+            stream_runnable=False
         )
     
     def process_message(self, user_input: str) -> str:
@@ -89,11 +254,31 @@ class SchedulingAgent:
             # Extract patient info from the message if possible
             self._extract_patient_info(user_input)
             
-            # Run the agent
-            result = self.agent_executor.invoke({
-                "input": user_input,
-                "chat_history": self.messages
-            })
+            # Book directly when the message fully specifies the request
+            direct_response = self._try_direct_booking(user_input)
+            if direct_response:
+                self.messages.append(HumanMessage(content=user_input))
+                self.messages.append(AIMessage(content=direct_response))
+                return direct_response
+            
+            # Reuse the answer to an identical informational question
+            cache_key = self._cache_key(user_input)
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                self.messages.append(HumanMessage(content=user_input))
+                self.messages.append(AIMessage(content=cached))
+                return cached
+            
+            # Run the agent, unless every slot stays taken for too long
+            if not _request_slots.acquire(timeout=REQUEST_SLOT_TIMEOUT):
+                return BUSY_RESPONSE
+            try:
+                result = self.agent_executor.invoke(
+                    {"input": user_input, "chat_history": self._chat_history()}
+                )
+            finally:
+                _request_slots.release()
+            _cache_response(cache_key, result)
             
             # Update chat history
             self.messages.append(HumanMessage(content=user_input))
@@ -102,28 +287,200 @@ class SchedulingAgent:
             return result["output"]
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
-            return "I'm sorry, I encountered an error while processing your request. Please try again."
+            return ERROR_RESPONSE
+    
+    def process_message_stream(self, user_input: str) -> Iterator[str]:
+        """Process a user message and yield the agent's response as it is generated"""
+        token_queue = queue.Queue()
+        result = {}
+        
+        def run_agent():
+            try:
+                if not _request_slots.acquire(timeout=REQUEST_SLOT_TIMEOUT):
+                    result["busy"] = True
+                    return
+                try:
+                    result.update(self.agent_executor.invoke(
+                        {"input": user_input, "chat_history": self._chat_history()},
+                        config={"callbacks": [_TokenQueueHandler(token_queue)]}
+                    ))
+                finally:
+                    _request_slots.release()
+            except Exception as e:
+                result["error"] = e
+            finally:
+                token_queue.put(None)
+        
+        # Extract patient info from the message if possible
+        self._extract_patient_info(user_input)
+        
+        # Book directly when the message fully specifies the request
+        try:
+            direct_response = self._try_direct_booking(user_input)
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}")
+            yield ERROR_RESPONSE
+            return
+        if direct_response:
+            yield direct_response
+            self.messages.append(HumanMessage(content=user_input))
+            self.messages.append(AIMessage(content=direct_response))
+            return
+        
+        # Reuse the answer to an identical informational question
+        cache_key = self._cache_key(user_input)
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            self.messages.append(HumanMessage(content=user_input))
+            self.messages.append(AIMessage(content=cached))
+            return
+        
+        # Run the agent in the background and relay tokens as they arrive
+        worker = threading.Thread(target=run_agent, daemon=True)
+        worker.start()
+        
+        shown = ""
+        pending = ""
+        last_emit = time.monotonic()
+        while True:
+            try:
+                token = token_queue.get(timeout=STREAM_FLUSH_INTERVAL)
+            except queue.Empty:
+                token = ""
+            if token is None:
+                break
+            if token is _STREAM_RESET:
+                pending = ""
+                if shown:
+                    shown = ""
+                    yield StreamReplacement("")
+                continue
+            pending += token
+            
+            # Only hand text to the UI once enough time or text has accumulated
+            now = time.monotonic()
+            if pending and (now - last_emit >= STREAM_FLUSH_INTERVAL or len(pending) >= STREAM_FLUSH_CHARS):
+                yield pending
+                shown += pending
+                pending = ""
+                last_emit = now
+        worker.join()
+        
+        if result.get("busy"):
+            response = BUSY_RESPONSE
+        elif "error" in result:
+            logger.error(f"Error processing message: {str(result['error'])}")
+            response = ERROR_RESPONSE
+        else:
+            response = result["output"]
+        
+        # Finish the streamed text, or replace it when it differs from the response
+        # (nothing streamed, a failure after partial output, or text the parser changed)
+        if shown + pending == response:
+            if pending:
+                yield pending
+        else:
+            yield StreamReplacement(response) if shown else response
+        if "output" not in result:
+            return
+        _cache_response(cache_key, result)
+        
+        # Update chat history
+        self.messages.append(HumanMessage(content=user_input))
+        self.messages.append(AIMessage(content=result["output"]))
+    
+    def _run_tool(self, name: str, **kwargs) -> Dict[str, Any]:
+        """Run a scheduling tool by name and decode its JSON response"""
+        return json.loads(self.tools_by_name[name].run(kwargs))
+    
+    def _try_direct_booking(self, user_input: str) -> Optional[str]:
+        """
+        Book an appointment without the LLM when the patient, doctor and slot are all known.
+        Returns None to fall back to the agent for anything ambiguous.
+        """
+        if not _BOOKING_INTENT_RE.search(user_input) or _NON_BOOKING_INTENT_RE.search(user_input):
+            return None
+        
+        doctor_match = _DOCTOR_RE.search(user_input)
+        slot_match = _SLOT_RE.search(user_input)
+        if not doctor_match or not slot_match:
+            return None
+        if not all(k in self.patient_info for k in ("first_name", "last_name", "date_of_birth")):
+            return None
+        
+        # Only returning patients can be booked directly; registration needs the agent
+        lookup = self._run_tool(
+            "patient_lookup",
+            first_name=self.patient_info["first_name"],
+            last_name=self.patient_info["last_name"],
+            date_of_birth=self.patient_info["date_of_birth"]
+        )
+        if not lookup.get("found"):
+            return None
+        patient_id = lookup["patient"]["id"]
+        
+        scheduled = self._run_tool(
+            "schedule_appointment",
+            patient_id=patient_id,
+            doctor_id=int(doctor_match.group(1)),
+            appointment_date=slot_match.group(1),
+            appointment_time=slot_match.group(2).zfill(5),
+            is_new_patient=False
+        )
+        if not scheduled.get("success"):
+            return None
+        appointment_id = scheduled["appointment_id"]
+        
+        confirmed = self._run_tool("confirm_appointment", appointment_id=appointment_id)
+        forms = self._run_tool("send_intake_forms", patient_id=patient_id, appointment_id=appointment_id)
+        
+        return " ".join(result["message"] for result in (scheduled, confirmed, forms))
+    
+    def _cache_key(self, user_input: str) -> str:
+        """Hash the normalized prompt with the patient info and the last exchange"""
+        recent = [message.content for message in list(self.messages)[-2:]]
+        payload = json.dumps(
+            [user_input.lower().strip(), self.patient_info, recent],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _chat_history(self) -> List:
+        """Build the chat history for the LLM: known patient info plus recent turns"""
+        history = list(self.messages)
+        if self.patient_info:
+            history.insert(0, SystemMessage(
+                content=f"Known patient info: {json.dumps(self.patient_info)}"
+            ))
+        return history
     
     def _extract_patient_info(self, message: str) -> None:
         """Extract patient information from the message using simple heuristics"""
         # This is a simple implementation - in a real system, you would use more sophisticated NLP
+        # Skip short replies ("yes", "ok") and messages without any name/DOB marker
+        if len(message) < _MIN_PATIENT_INFO_LENGTH:
+            return
+        lowered = message.lower()
+        if not any(keyword in lowered for keyword in _PATIENT_INFO_KEYWORDS):
+            return
+        
         # Look for name patterns
-        if "name is" in message.lower():
-            name_parts = message.split("name is")[1].strip().split()
-            if len(name_parts) >= 2:
-                self.patient_info["first_name"] = name_parts[0].strip(",.")
-                self.patient_info["last_name"] = name_parts[1].strip(",.") 
+        if "name is" in lowered:
+            name_match = _NAME_RE.search(message)
+            if name_match:
+                self.patient_info["first_name"] = name_match.group(1)
+                self.patient_info["last_name"] = name_match.group(2)
         
         # Look for DOB patterns
-        if "born on" in message.lower() or "dob" in message.lower() or "date of birth" in message.lower():
-            # Simple pattern matching for dates
-            # In a real system, use a more robust date parser
-            for word in message.split():
-                if "/" in word and len(word) >= 8:
-                    self.patient_info["date_of_birth"] = word
-                    break
+        if any(key in lowered for key in _DOB_KEYS):
+            dob_match = _DOB_RE.search(message)
+            if dob_match:
+                date_of_birth = _normalize_dob(dob_match.group(1))
+                if date_of_birth:
+                    self.patient_info["date_of_birth"] = date_of_birth
     
     def reset_conversation(self) -> None:
         """Reset the conversation history and patient info"""
-        self.messages = []
+        self.messages = deque(maxlen=MAX_HISTORY_MESSAGES)
         self.patient_info = {}
\ No newline at end of file
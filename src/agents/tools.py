@@ -1,13 +1,17 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import json
-import pandas as pd
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import time
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from src.models.patient import Patient, Insurance
-from src.models.appointment import Doctor, Appointment, Reminder, Form
+from src.models.patient import Patient
+from src.models.appointment import Doctor, Reminder, Form
 from src.utils.database import (
     get_patient_by_name_dob, 
     create_patient, 
@@ -15,16 +19,82 @@ from src.utils.database import (
     create_appointment,
     get_doctor_by_id,
     get_patient_by_id,
+    get_patient_name,
     create_insurance,
     update_appointment_status,
-    create_form,
+    create_forms_bulk,
+    get_appointment_details,
     export_appointment_to_excel
 )
+from src.utils.forms import FORMS_DIR
 from src.utils.communication import (
     send_appointment_confirmation,
     send_intake_forms
 )
 
+# Tool response helpers
+def _dumps(**fields) -> str:
+    """Serialize a tool response for the LLM (models are serialized natively, without to_dict)"""
+    return orjson.dumps(fields).decode()
+
+def _ok(**fields) -> str:
+    return _dumps(success=True, **fields)
+
+def _err(message: str, **fields) -> str:
+    return _dumps(success=False, message=message, **fields)
+
+# Worker pool for running independent lookups concurrently
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Cached lookups for tool calls
+AVAILABILITY_TTL = 30  # seconds
+AVAILABILITY_CACHE_SIZE = 256
+_availability_cache = OrderedDict()
+_availability_cache_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=256)
+def _doctor_row_cached(doctor_id):
+    return get_doctor_by_id(doctor_id)
+
+@functools.lru_cache(maxsize=256)
+def _patient_row_cached(patient_id):
+    return get_patient_by_id(patient_id)
+
+def _doctor_cached(doctor_id):
+    """Get a doctor built fresh from the cached row, so callers never share a mutable record"""
+    row = _doctor_row_cached(doctor_id)
+    return Doctor.from_dict(row) if row else None
+
+def _patient_cached(patient_id):
+    """Get a patient built fresh from the cached row, so callers never share a mutable record"""
+    row = _patient_row_cached(patient_id)
+    return Patient.from_dict(row) if row else None
+
+def _availability_cached(doctor_id, date):
+    """Get a doctor's availability, reusing results younger than AVAILABILITY_TTL"""
+    key = (doctor_id, date)
+    now = time.monotonic()
+    with _availability_cache_lock:
+        cached = _availability_cache.get(key)
+        if cached and now - cached[0] < AVAILABILITY_TTL:
+            return cached[1]
+    
+    # Availability is an immutable tuple, so the cached value can be handed out as is
+    availability = get_doctor_availability(doctor_id, date)
+    with _availability_cache_lock:
+        _availability_cache[key] = (now, availability)
+        _availability_cache.move_to_end(key)
+        if len(_availability_cache) > AVAILABILITY_CACHE_SIZE:
+            _availability_cache.popitem(last=False)
+    return availability
+
+def _invalidate_patients():
+    _patient_row_cached.cache_clear()
+
+def _invalidate_availability():
+    with _availability_cache_lock:
+        _availability_cache.clear()
+
 # Input schemas for tools
 class PatientLookupInput(BaseModel):
     first_name: str = Field(description="Patient's first name")
@@ -77,16 +147,16 @@ class PatientLookupTool(BaseTool):
         patient = get_patient_by_name_dob(first_name, last_name, date_of_birth)
         
         if patient:
-            return json.dumps({
-                "found": True,
-                "patient": patient.to_dict(),
-                "message": f"Found patient record for {patient.full_name}"
-            })
+            return _dumps(
+                found=True,
+                patient=patient,
+                message=f"Found patient record for {patient.full_name}"
+            )
         else:
-            return json.dumps({
-                "found": False,
-                "message": f"No patient record found for {first_name} {last_name} with DOB {date_of_birth}"
-            })
+            return _dumps(
+                found=False,
+                message=f"No patient record found for {first_name} {last_name} with DOB {date_of_birth}"
+            )
 
 class PatientRegistrationTool(BaseTool):
     name: str = "patient_registration"
@@ -106,11 +176,10 @@ class PatientRegistrationTool(BaseTool):
         existing_patient = get_patient_by_name_dob(first_name, last_name, date_of_birth)
         
         if existing_patient:
-            return json.dumps({
-                "success": False,
-                "message": f"Patient {first_name} {last_name} already exists in our system",
-                "patient": existing_patient.to_dict()
-            })
+            return _err(
+                f"Patient {first_name} {last_name} already exists in our system",
+                patient=existing_patient
+            )
         
         # Create new patient
         patient = Patient(
@@ -122,19 +191,24 @@ class PatientRegistrationTool(BaseTool):
             address=address
         )
         
-        created_patient = create_patient(patient)
+        patient.id = create_patient(
+            patient.first_name,
+            patient.last_name,
+            patient.date_of_birth,
+            patient.email,
+            patient.phone,
+            patient.address
+        )
+        # A lookup of this ID before it existed may have cached a miss
+        _invalidate_patients()
         
-        if created_patient:
-            return json.dumps({
-                "success": True,
-                "message": f"Successfully registered patient {first_name} {last_name}",
-                "patient": created_patient.to_dict()
-            })
+        if patient.id:
+            return _ok(
+                message=f"Successfully registered patient {first_name} {last_name}",
+                patient=patient
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": "Failed to register patient due to a database error"
-            })
+            return _err("Failed to register patient due to a database error")
 
 class DoctorAvailabilityTool(BaseTool):
     name: str = "doctor_availability"
@@ -142,27 +216,20 @@ class DoctorAvailabilityTool(BaseTool):
     args_schema = DoctorAvailabilityInput
     
     def _run(self, doctor_id: int, date: str) -> str:
-        doctor = get_doctor_by_id(doctor_id)
+        doctor = _doctor_cached(doctor_id)
         if not doctor:
-            return json.dumps({
-                "success": False,
-                "message": f"No doctor found with ID {doctor_id}"
-            })
+            return _err(f"No doctor found with ID {doctor_id}")
         
-        availability = get_doctor_availability(doctor_id, date)
+        availability = _availability_cached(doctor_id, date)
         
         if availability:
-            return json.dumps({
-                "success": True,
-                "doctor": doctor.to_dict(),
-                "date": date,
-                "available_slots": availability
-            })
+            return _ok(
+                doctor=doctor,
+                date=date,
+                available_slots=availability
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": f"No available slots for Dr. {doctor.last_name} on {date}"
-            })
+            return _err(f"No available slots for Dr. {doctor.last_name} on {date}")
 
 class AppointmentSchedulingTool(BaseTool):
     name: str = "schedule_appointment"
@@ -178,54 +245,44 @@ class AppointmentSchedulingTool(BaseTool):
         is_new_patient: bool, 
         notes: Optional[str] = None
     ) -> str:
+        # Look up the patient, doctor and availability concurrently
+        patient_future = _POOL.submit(_patient_cached, patient_id)
+        doctor_future = _POOL.submit(_doctor_cached, doctor_id)
+        availability_future = _POOL.submit(_availability_cached, doctor_id, appointment_date)
+        patient = patient_future.result()
+        doctor = doctor_future.result()
+        availability = availability_future.result()
+        
         # Verify patient exists
-        patient = get_patient_by_id(patient_id)
         if not patient:
-            return json.dumps({
-                "success": False,
-                "message": f"No patient found with ID {patient_id}"
-            })
+            return _err(f"No patient found with ID {patient_id}")
         
         # Verify doctor exists
-        doctor = get_doctor_by_id(doctor_id)
         if not doctor:
-            return json.dumps({
-                "success": False,
-                "message": f"No doctor found with ID {doctor_id}"
-            })
+            return _err(f"No doctor found with ID {doctor_id}")
         
         # Check if the slot is available
-        availability = get_doctor_availability(doctor_id, appointment_date)
         if not availability or appointment_time not in availability:
-            return json.dumps({
-                "success": False,
-                "message": f"The selected time slot {appointment_time} is not available"
-            })
+            return _err(f"The selected time slot {appointment_time} is not available")
         
         # Create appointment
-        appointment = Appointment(
-            patient_id=patient_id,
-            doctor_id=doctor_id,
-            appointment_date=appointment_date,
-            appointment_time=appointment_time,
-            duration=60 if is_new_patient else 30,  # 60 min for new patients, 30 min for returning
-            status="scheduled",
-            notes=notes
+        appointment_id = create_appointment(
+            patient_id,
+            doctor_id,
+            appointment_date,
+            appointment_time,
+            60 if is_new_patient else 30,  # 60 min for new patients, 30 min for returning
+            notes
         )
+        _invalidate_availability()
         
-        created_appointment = create_appointment(appointment)
-        
-        if created_appointment:
-            return json.dumps({
-                "success": True,
-                "message": f"Successfully scheduled appointment for {patient.full_name} with Dr. {doctor.last_name}",
-                "appointment": created_appointment.to_dict()
-            })
+        if appointment_id:
+            return _ok(
+                message=f"Successfully scheduled appointment {appointment_id} for {patient.full_name} with Dr. {doctor.last_name}",
+                appointment_id=appointment_id
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": "Failed to schedule appointment due to a database error"
-            })
+            return _err("Failed to schedule appointment due to a database error")
 
 class InsuranceCollectionTool(BaseTool):
     name: str = "collect_insurance"
@@ -233,35 +290,21 @@ class InsuranceCollectionTool(BaseTool):
     args_schema = InsuranceCollectionInput
     
     def _run(self, patient_id: int, carrier: str, member_id: str, group_id: Optional[str] = None) -> str:
-        # Verify patient exists
-        patient = get_patient_by_id(patient_id)
+        # Verify patient exists (only the name is needed here)
+        patient = get_patient_name(patient_id)
         if not patient:
-            return json.dumps({
-                "success": False,
-                "message": f"No patient found with ID {patient_id}"
-            })
+            return _err(f"No patient found with ID {patient_id}")
         
         # Create insurance record
-        insurance = Insurance(
-            patient_id=patient_id,
-            carrier=carrier,
-            member_id=member_id,
-            group_id=group_id
-        )
-        
-        created_insurance = create_insurance(insurance)
+        insurance_id = create_insurance(patient_id, carrier, member_id, group_id)
         
-        if created_insurance:
-            return json.dumps({
-                "success": True,
-                "message": f"Successfully collected insurance information for {patient.full_name}",
-                "insurance": created_insurance.to_dict()
-            })
+        if insurance_id:
+            return _ok(
+                message=f"Successfully collected insurance information for {patient['first_name']} {patient['last_name']}",
+                insurance_id=insurance_id
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": "Failed to collect insurance information due to a database error"
-            })
+            return _err("Failed to collect insurance information due to a database error")
 
 class AppointmentConfirmationTool(BaseTool):
     name: str = "confirm_appointment"
@@ -269,28 +312,30 @@ class AppointmentConfirmationTool(BaseTool):
     args_schema = AppointmentConfirmationInput
     
     def _run(self, appointment_id: int) -> str:
-        # Update appointment status
-        updated = update_appointment_status(appointment_id, "confirmed")
+        details = get_appointment_details(appointment_id)
+        if not details:
+            return _err(f"No appointment found with ID {appointment_id}")
         
-        if not updated:
-            return json.dumps({
-                "success": False,
-                "message": f"No appointment found with ID {appointment_id}"
-            })
+        # Update appointment status
+        update_appointment_status(appointment_id, "confirmed")
+        _invalidate_availability()
         
-        # Send confirmation email (simulated)
-        sent = send_appointment_confirmation(appointment_id)
+        # Send confirmation email and SMS (simulated)
+        email_sent, sms_sent = send_appointment_confirmation(
+            details["patient_email"],
+            details["patient_phone"],
+            {
+                "patient_name": f"{details['patient_first_name']} {details['patient_last_name']}",
+                "appointment_date": details["appointment_date"],
+                "appointment_time": details["appointment_time"],
+                "doctor_name": f"{details['doctor_first_name']} {details['doctor_last_name']}"
+            }
+        )
         
-        if sent:
-            return json.dumps({
-                "success": True,
-                "message": f"Appointment {appointment_id} confirmed and confirmation sent to patient"
-            })
+        if email_sent or sms_sent:
+            return _ok(message=f"Appointment {appointment_id} confirmed and confirmation sent to patient")
         else:
-            return json.dumps({
-                "success": True,
-                "message": f"Appointment {appointment_id} confirmed but failed to send confirmation"
-            })
+            return _ok(message=f"Appointment {appointment_id} confirmed but failed to send confirmation")
 
 class FormDistributionTool(BaseTool):
     name: str = "send_intake_forms"
@@ -299,41 +344,28 @@ class FormDistributionTool(BaseTool):
     
     def _run(self, patient_id: int, appointment_id: int) -> str:
         # Verify patient exists
-        patient = get_patient_by_id(patient_id)
+        patient = _patient_cached(patient_id)
         if not patient:
-            return json.dumps({
-                "success": False,
-                "message": f"No patient found with ID {patient_id}"
-            })
+            return _err(f"No patient found with ID {patient_id}")
         
         # Create form records
         form_types = ["patient_information", "medical_history", "insurance_verification"]
-        created_forms = []
-        
-        for form_type in form_types:
-            form = Form(
-                patient_id=patient_id,
-                form_type=form_type,
-                status="pending"
-            )
-            created_form = create_form(form)
-            if created_form:
-                created_forms.append(created_form)
+        created_forms = create_forms_bulk([
+            Form(patient_id=patient_id, form_type=form_type, status="pending")
+            for form_type in form_types
+        ])
         
         # Send forms via email (simulated)
-        sent = send_intake_forms(patient_id, [f.id for f in created_forms])
+        form_files = [str(FORMS_DIR / f"{form_type}.pdf") for form_type in form_types]
+        sent = send_intake_forms(patient.email, patient.full_name, form_files)
         
         if sent:
-            return json.dumps({
-                "success": True,
-                "message": f"Successfully sent intake forms to {patient.full_name}",
-                "forms": [f.to_dict() for f in created_forms]
-            })
+            return _ok(
+                message=f"Successfully sent intake forms to {patient.full_name}",
+                forms=created_forms
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": f"Failed to send intake forms to {patient.full_name}"
-            })
+            return _err(f"Failed to send intake forms to {patient.full_name}")
 
 class AppointmentExportTool(BaseTool):
     name: str = "export_appointment"
@@ -345,26 +377,25 @@ class AppointmentExportTool(BaseTool):
         excel_path = export_appointment_to_excel(appointment_id)
         
         if excel_path:
-            return json.dumps({
-                "success": True,
-                "message": f"Successfully exported appointment {appointment_id} to Excel",
-                "excel_path": excel_path
-            })
+            return _ok(
+                message=f"Successfully exported appointment {appointment_id} to Excel",
+                excel_path=excel_path
+            )
         else:
-            return json.dumps({
-                "success": False,
-                "message": f"Failed to export appointment {appointment_id} to Excel"
-            })
+            return _err(f"Failed to export appointment {appointment_id} to Excel")
+
+# Tools are stateless, so they are constructed once per process
+_SCHEDULING_TOOLS = [
+    PatientLookupTool(),
+    PatientRegistrationTool(),
+    DoctorAvailabilityTool(),
+    AppointmentSchedulingTool(),
+    InsuranceCollectionTool(),
+    AppointmentConfirmationTool(),
+    FormDistributionTool(),
+    AppointmentExportTool()
+]
 
 # List of all tools
 def get_scheduling_tools() -> List[BaseTool]:
-    return [
-        PatientLookupTool(),
-        PatientRegistrationTool(),
-        DoctorAvailabilityTool(),
-        AppointmentSchedulingTool(),
-        InsuranceCollectionTool(),
-        AppointmentConfirmationTool(),
-        FormDistributionTool(),
-        AppointmentExportTool()
-    ]
\ No newline at end of file
+    return list(_SCHEDULING_TOOLS)
\ No newline at end of file
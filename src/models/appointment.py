@@ -1,8 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
 
-@dataclass
+from .serialization import fast_to_dict
+
+def _parse_datetime(date: str, time: str) -> datetime:
+    """Parse YYYY-MM-DD and HH:MM strings, slicing the fixed-width forms instead of calling strptime"""
+    if len(date) == 10 and date[4] == '-' and date[7] == '-' and len(time) == 5 and time[2] == ':':
+        return datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]), int(time[0:2]), int(time[3:5]))
+    return datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+
+@fast_to_dict
+@dataclass(slots=True)
 class Doctor:
     """Doctor data model"""
     id: Optional[int] = None
@@ -11,36 +20,34 @@ class Doctor:
     specialty: str = ""
     email: Optional[str] = None
     phone: Optional[str] = None
+    # Full name, built once since names are not changed after construction
+    _full_name: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._full_name = self.first_name + " " + self.last_name
     
     @property
     def full_name(self) -> str:
         """Get the doctor's full name"""
-        return f"{self.first_name} {self.last_name}"
-    
-    def to_dict(self) -> dict:
-        """Convert doctor to dictionary"""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'specialty': self.specialty,
-            'email': self.email,
-            'phone': self.phone
-        }
+        return self._full_name
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Doctor':
         """Create a Doctor instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            first_name=data.get('first_name', ""),
-            last_name=data.get('last_name', ""),
-            specialty=data.get('specialty', ""),
-            email=data.get('email'),
-            phone=data.get('phone')
-        )
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.first_name = _get('first_name', "")
+        obj.last_name = _get('last_name', "")
+        obj.specialty = _get('specialty', "")
+        obj.email = _get('email')
+        obj.phone = _get('phone')
+        obj._full_name = obj.first_name + " " + obj.last_name
+        return obj
 
-@dataclass
+@fast_to_dict
+@dataclass(slots=True)
 class Appointment:
     """Appointment data model"""
     id: Optional[int] = None
@@ -53,6 +60,8 @@ class Appointment:
     notes: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    # Parsed appointment datetime, keyed by the (date, time) strings it was parsed from
+    _datetime_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def is_new_patient_appointment(self) -> bool:
@@ -65,44 +74,38 @@ class Appointment:
         if not self.appointment_date or not self.appointment_time:
             return None
         
+        key = (self.appointment_date, self.appointment_time)
+        if self._datetime_cache and self._datetime_cache[0] == key:
+            return self._datetime_cache[1]
+        
         try:
-            dt_str = f"{self.appointment_date} {self.appointment_time}"
-            return datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+            parsed = _parse_datetime(self.appointment_date, self.appointment_time)
         except ValueError:
             return None
-    
-    def to_dict(self) -> dict:
-        """Convert appointment to dictionary"""
-        return {
-            'id': self.id,
-            'patient_id': self.patient_id,
-            'doctor_id': self.doctor_id,
-            'appointment_date': self.appointment_date,
-            'appointment_time': self.appointment_time,
-            'duration': self.duration,
-            'status': self.status,
-            'notes': self.notes,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        self._datetime_cache = (key, parsed)
+        return parsed
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Appointment':
         """Create an Appointment instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            patient_id=data.get('patient_id', 0),
-            doctor_id=data.get('doctor_id', 0),
-            appointment_date=data.get('appointment_date', ""),
-            appointment_time=data.get('appointment_time', ""),
-            duration=data.get('duration', 30),
-            status=data.get('status', "scheduled"),
-            notes=data.get('notes'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.patient_id = _get('patient_id', 0)
+        obj.doctor_id = _get('doctor_id', 0)
+        obj.appointment_date = _get('appointment_date', "")
+        obj.appointment_time = _get('appointment_time', "")
+        obj.duration = _get('duration', 30)
+        obj.status = _get('status', "scheduled")
+        obj.notes = _get('notes')
+        obj.created_at = _get('created_at')
+        obj.updated_at = _get('updated_at')
+        obj._datetime_cache = None
+        return obj
 
-@dataclass
+@fast_to_dict
+@dataclass(slots=True)
 class Reminder:
     """Reminder data model"""
     id: Optional[int] = None
@@ -113,32 +116,23 @@ class Reminder:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
-    def to_dict(self) -> dict:
-        """Convert reminder to dictionary"""
-        return {
-            'id': self.id,
-            'appointment_id': self.appointment_id,
-            'reminder_type': self.reminder_type,
-            'scheduled_time': self.scheduled_time,
-            'status': self.status,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-    
     @classmethod
     def from_dict(cls, data: dict) -> 'Reminder':
         """Create a Reminder instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            appointment_id=data.get('appointment_id', 0),
-            reminder_type=data.get('reminder_type', ""),
-            scheduled_time=data.get('scheduled_time', ""),
-            status=data.get('status', "pending"),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.appointment_id = _get('appointment_id', 0)
+        obj.reminder_type = _get('reminder_type', "")
+        obj.scheduled_time = _get('scheduled_time', "")
+        obj.status = _get('status', "pending")
+        obj.created_at = _get('created_at')
+        obj.updated_at = _get('updated_at')
+        return obj
 
-@dataclass
+@fast_to_dict
+@dataclass(slots=True)
 class Form:
     """Form data model"""
     id: Optional[int] = None
@@ -150,29 +144,28 @@ class Form:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
-    def to_dict(self) -> dict:
-        """Convert form to dictionary"""
-        return {
-            'id': self.id,
-            'patient_id': self.patient_id,
-            'form_type': self.form_type,
-            'status': self.status,
-            'sent_at': self.sent_at,
-            'completed_at': self.completed_at,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-    
     @classmethod
     def from_dict(cls, data: dict) -> 'Form':
         """Create a Form instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            patient_id=data.get('patient_id', 0),
-            form_type=data.get('form_type', ""),
-            status=data.get('status', "pending"),
-            sent_at=data.get('sent_at'),
-            completed_at=data.get('completed_at'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
\ No newline at end of file
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.patient_id = _get('patient_id', 0)
+        obj.form_type = _get('form_type', "")
+        obj.status = _get('status', "pending")
+        obj.sent_at = _get('sent_at')
+        obj.completed_at = _get('completed_at')
+        obj.created_at = _get('created_at')
+        obj.updated_at = _get('updated_at')
+        return obj
+
+def parse_appointment_datetimes(appointments: List[Appointment]):
+    """
+    Parse the date and time of many appointments in one vectorized pass.
+    Returns a numpy datetime64 array; unparseable entries become NaT.
+    """
+    import pandas as pd
+    
+    combined = pd.Series([f"{a.appointment_date} {a.appointment_time}" for a in appointments], dtype=object)
+    return pd.to_datetime(combined, format="%Y-%m-%d %H:%M", errors="coerce", cache=True).values
@@ -1,8 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
 
-@dataclass
+from .serialization import fast_to_dict
+
+def _parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD date, slicing the fixed-width form instead of calling strptime"""
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    return datetime.strptime(value, "%Y-%m-%d")
+
+@fast_to_dict
+@dataclass(slots=True)
 class Patient:
     """Patient data model"""
     id: Optional[int] = None
@@ -14,11 +23,18 @@ class Patient:
     address: Optional[str] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    # Parsed date of birth, keyed by the string it was parsed from
+    _dob_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Full name, built once since names are not changed after construction
+    _full_name: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._full_name = self.first_name + " " + self.last_name
     
     @property
     def full_name(self) -> str:
         """Get the patient's full name"""
-        return f"{self.first_name} {self.last_name}"
+        return self._full_name
     
     @property
     def age(self) -> Optional[int]:
@@ -26,44 +42,39 @@ class Patient:
         if not self.date_of_birth:
             return None
         
-        try:
-            dob = datetime.strptime(self.date_of_birth, "%Y-%m-%d")
-            today = datetime.now()
-            age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-            return age
-        except ValueError:
-            return None
-    
-    def to_dict(self) -> dict:
-        """Convert patient to dictionary"""
-        return {
-            'id': self.id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'date_of_birth': self.date_of_birth,
-            'email': self.email,
-            'phone': self.phone,
-            'address': self.address,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        if self._dob_cache and self._dob_cache[0] == self.date_of_birth:
+            dob = self._dob_cache[1]
+        else:
+            try:
+                dob = _parse_date(self.date_of_birth)
+            except ValueError:
+                return None
+            self._dob_cache = (self.date_of_birth, dob)
+        
+        today = datetime.now()
+        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Patient':
         """Create a Patient instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            first_name=data.get('first_name', ""),
-            last_name=data.get('last_name', ""),
-            date_of_birth=data.get('date_of_birth', ""),
-            email=data.get('email'),
-            phone=data.get('phone'),
-            address=data.get('address'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.first_name = _get('first_name', "")
+        obj.last_name = _get('last_name', "")
+        obj.date_of_birth = _get('date_of_birth', "")
+        obj.email = _get('email')
+        obj.phone = _get('phone')
+        obj.address = _get('address')
+        obj.created_at = _get('created_at')
+        obj.updated_at = _get('updated_at')
+        obj._dob_cache = None
+        obj._full_name = obj.first_name + " " + obj.last_name
+        return obj
 
-@dataclass
+@fast_to_dict
+@dataclass(slots=True)
 class Insurance:
     """Insurance data model"""
     id: Optional[int] = None
@@ -74,27 +85,17 @@ class Insurance:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
-    def to_dict(self) -> dict:
-        """Convert insurance to dictionary"""
-        return {
-            'id': self.id,
-            'patient_id': self.patient_id,
-            'carrier': self.carrier,
-            'member_id': self.member_id,
-            'group_id': self.group_id,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-    
     @classmethod
     def from_dict(cls, data: dict) -> 'Insurance':
         """Create an Insurance instance from a dictionary"""
-        return cls(
-            id=data.get('id'),
-            patient_id=data.get('patient_id', 0),
-            carrier=data.get('carrier', ""),
-            member_id=data.get('member_id', ""),
-            group_id=data.get('group_id'),
-            created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
-        )
\ No newline at end of file
+        # Bypass __init__; fields are assigned directly to their slots
+        obj = object.__new__(cls)
+        _get = data.get
+        obj.id = _get('id')
+        obj.patient_id = _get('patient_id', 0)
+        obj.carrier = _get('carrier', "")
+        obj.member_id = _get('member_id', "")
+        obj.group_id = _get('group_id')
+        obj.created_at = _get('created_at')
+        obj.updated_at = _get('updated_at')
+        return obj
\ No newline at end of file
@@ -0,0 +1,23 @@
+import functools
+from dataclasses import fields
+
+@functools.lru_cache(maxsize=None)
+def field_names(cls) -> tuple:
+    """Public field names of a dataclass, computed once per class"""
+    return tuple(f.name for f in fields(cls) if not f.name.startswith('_'))
+
+def fast_to_dict(cls):
+    """
+    Class decorator that generates a specialized to_dict for a dataclass.
+    The method returns a dict literal over the public fields, built once with exec
+    (the same codegen approach dataclasses uses for __init__).
+    """
+    items = ", ".join(f"{name!r}: self.{name}" for name in field_names(cls))
+    namespace = {}
+    exec(f"def to_dict(self):\n    return {{{items}}}", namespace)
+    
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = f"Convert {cls.__name__.lower()} to dictionary"
+    cls.to_dict = to_dict
+    return cls
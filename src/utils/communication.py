@@ -1,11 +1,15 @@
 import os
+import mmap
 import smtplib
 import logging
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from datetime import datetime
-import pandas as pd
 
 # For a real implementation, we would use a proper SMS service like Twilio
 # For this demo, we'll simulate SMS sending with logging
@@ -18,6 +22,225 @@ from ..config import (
     TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER
 )
 
+# Configuration checks are evaluated once at import rather than on every send
+_EMAIL_CONFIGURED = bool(EMAIL_HOST and EMAIL_PORT and EMAIL_USERNAME and EMAIL_PASSWORD)
+_TWILIO_CONFIGURED = bool(TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER)
+_EMAIL_PORT = int(EMAIL_PORT) if EMAIL_PORT else None
+
+# Message templates, filled with str.format_map so each send reuses one template string
+_CONFIRMATION_SUBJECT = "Your Medical Appointment Confirmation"
+_CONFIRMATION_EMAIL = """
+    <html>
+    <body>
+        <h2>Appointment Confirmation</h2>
+        <p>Dear {patient_name},</p>
+        <p>Your appointment has been scheduled successfully:</p>
+        <ul>
+            <li><strong>Date:</strong> {appointment_date}</li>
+            <li><strong>Time:</strong> {appointment_time}</li>
+            <li><strong>Doctor:</strong> {doctor_name}</li>
+            <li><strong>Location:</strong> {location}</li>
+        </ul>
+        <p>Please arrive 15 minutes before your scheduled appointment time.</p>
+        <p>If you need to reschedule or cancel, please contact us at least 24 hours in advance.</p>
+        <p>Thank you for choosing our medical practice.</p>
+    </body>
+    </html>
+    """
+_CONFIRMATION_SMS = "Appointment confirmed with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
+
+_REMINDER_7_DAY_EMAIL = """
+        <html>
+        <body>
+            <h2>Appointment Reminder</h2>
+            <p>Dear {patient_name},</p>
+            <p>This is a friendly reminder about your upcoming appointment:</p>
+            <ul>
+                <li><strong>Date:</strong> {appointment_date}</li>
+                <li><strong>Time:</strong> {appointment_time}</li>
+                <li><strong>Doctor:</strong> {doctor_name}</li>
+                <li><strong>Location:</strong> {location}</li>
+            </ul>
+            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
+            <p>If you need to reschedule or cancel, please contact us at least 24 hours in advance.</p>
+            <p>Thank you for choosing our medical practice.</p>
+        </body>
+        </html>
+        """
+_REMINDER_7_DAY_SMS = "Reminder: You have an appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
+
+_REMINDER_3_DAY_EMAIL = """
+        <html>
+        <body>
+            <h2>Appointment Reminder</h2>
+            <p>Dear {patient_name},</p>
+            <p>Your appointment is coming up soon:</p>
+            <ul>
+                <li><strong>Date:</strong> {appointment_date}</li>
+                <li><strong>Time:</strong> {appointment_time}</li>
+                <li><strong>Doctor:</strong> {doctor_name}</li>
+                <li><strong>Location:</strong> {location}</li>
+            </ul>
+            <p><strong>Have you completed your intake forms?</strong> If not, please complete them before your appointment to save time.</p>
+            <p><strong>Is your appointment still confirmed?</strong> Please reply to confirm or call us to reschedule.</p>
+            <p>Thank you for choosing our medical practice.</p>
+        </body>
+        </html>
+        """
+_REMINDER_3_DAY_SMS = "Reminder: Appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Have you completed your forms? Is your appointment confirmed? Reply Y to confirm or call to reschedule."
+
+_REMINDER_1_DAY_EMAIL = """
+        <html>
+        <body>
+            <h2>Final Appointment Reminder</h2>
+            <p>Dear {patient_name},</p>
+            <p>This is your final reminder about your appointment tomorrow:</p>
+            <ul>
+                <li><strong>Date:</strong> {appointment_date}</li>
+                <li><strong>Time:</strong> {appointment_time}</li>
+                <li><strong>Doctor:</strong> {doctor_name}</li>
+                <li><strong>Location:</strong> {location}</li>
+            </ul>
+            <p><strong>Important:</strong></p>
+            <ol>
+                <li>Have you completed your intake forms? If not, please do so immediately.</li>
+                <li>Is your appointment confirmed? If you need to cancel, please let us know immediately.</li>
+                <li>If you need to cancel, please provide a reason so we can better assist you.</li>
+            </ol>
+            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
+            <p>Thank you for choosing our medical practice.</p>
+        </body>
+        </html>
+        """
+_REMINDER_1_DAY_SMS = "FINAL REMINDER: Appointment tomorrow with Dr. {doctor_name} at {appointment_time}. Have you completed your forms? Is your appointment confirmed? If you need to cancel, please provide a reason. Reply Y to confirm."
+
+_REMINDER_EMAIL = """
+        <html>
+        <body>
+            <h2>Appointment Reminder</h2>
+            <p>Dear {patient_name},</p>
+            <p>This is a reminder about your upcoming appointment:</p>
+            <ul>
+                <li><strong>Date:</strong> {appointment_date}</li>
+                <li><strong>Time:</strong> {appointment_time}</li>
+                <li><strong>Doctor:</strong> {doctor_name}</li>
+                <li><strong>Location:</strong> {location}</li>
+            </ul>
+            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
+            <p>Thank you for choosing our medical practice.</p>
+        </body>
+        </html>
+        """
+_REMINDER_SMS = "Reminder: You have an appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
+
+# Reminder type -> (subject, email template, SMS template)
+_REMINDER_TABLE = {
+    # First reminder - just a simple reminder
+    '7-day': ("Upcoming Appointment Reminder", _REMINDER_7_DAY_EMAIL, _REMINDER_7_DAY_SMS),
+    # Second reminder - ask about forms
+    '3-day': ("Important: Appointment Forms Reminder", _REMINDER_3_DAY_EMAIL, _REMINDER_3_DAY_SMS),
+    # Final reminder - ask about forms and confirmation
+    '1-day': ("FINAL REMINDER: Your Appointment Tomorrow", _REMINDER_1_DAY_EMAIL, _REMINDER_1_DAY_SMS)
+}
+# Generic reminder
+_DEFAULT_REMINDER = ("Appointment Reminder", _REMINDER_EMAIL, _REMINDER_SMS)
+
+_INTAKE_FORMS_SUBJECT = "Important: Your Medical Intake Forms"
+_INTAKE_FORMS_EMAIL = """
+    <html>
+    <body>
+        <h2>Medical Intake Forms</h2>
+        <p>Dear {patient_name},</p>
+        <p>Please find attached the intake forms for your upcoming appointment.</p>
+        <p><strong>Instructions:</strong></p>
+        <ol>
+            <li>Please complete all forms prior to your appointment.</li>
+            <li>Bring the completed forms with you or email them back to us.</li>
+            <li>If you have any questions about the forms, please contact our office.</li>
+        </ol>
+        <p>Thank you for choosing our medical practice.</p>
+    </body>
+    </html>
+    """
+
+# Worker pool for sending independent notifications concurrently
+_IO_POOL = ThreadPoolExecutor(max_workers=8)
+
+def _send_email_and_sms(patient_email, subject, email_body, patient_phone, sms_message):
+    """Send an email and an SMS concurrently and return (email_success, sms_success)"""
+    email_future = _IO_POOL.submit(send_email, patient_email, subject, email_body)
+    sms_future = _IO_POOL.submit(send_sms, patient_phone, sms_message)
+    return (email_future.result(), sms_future.result())
+
+# One authenticated SMTP connection per thread, reused across sends
+_SMTP_POOL = threading.local()
+
+def _close_smtp(conn):
+    """Quit an SMTP connection, just closing the socket if the server has already gone away"""
+    try:
+        conn.quit()
+    except Exception:
+        conn.close()
+
+class _PooledSMTP:
+    """
+    Holds a thread's SMTP connection in the thread-local pool. The holder is dropped with the
+    thread's locals when the thread exits, and its finalizer then quits the connection
+    (finalizers still pending at interpreter exit run then).
+    """
+    __slots__ = ('conn', 'finalizer', '__weakref__')
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.finalizer = weakref.finalize(self, _close_smtp, conn)
+
+def _get_smtp():
+    """Return this thread's SMTP connection, connecting and logging in on first use"""
+    pooled = getattr(_SMTP_POOL, 'pooled', None)
+    if pooled is None:
+        conn = smtplib.SMTP(EMAIL_HOST, _EMAIL_PORT)
+        conn.starttls()
+        conn.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+        pooled = _SMTP_POOL.pooled = _PooledSMTP(conn)
+    return pooled.conn
+
+def _drop_smtp():
+    """Discard this thread's SMTP connection so the next send reconnects"""
+    pooled = getattr(_SMTP_POOL, 'pooled', None)
+    if pooled is None:
+        return
+    _SMTP_POOL.pooled = None
+    pooled.finalizer()
+
+def _attachment_part(file_path, name):
+    """
+    Build a base64 MIME part for a file, memory-mapping it so the raw bytes
+    are read from the page cache instead of being copied into the heap
+    """
+    with open(file_path, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return MIMEApplication(file.read(), Name=name)
+    with data:
+        # MIMEApplication base64-encodes the payload immediately, so the map can be closed after
+        return MIMEApplication(data, Name=name)
+
+# (key, default) pairs read from appointment_details by the message templates
+_TEMPLATE_KEYS = (
+    ('patient_name', None),
+    ('appointment_date', None),
+    ('appointment_time', None),
+    ('doctor_name', None),
+    ('location', 'Main Clinic')
+)
+
+def _template_fields(appointment_details):
+    """Collect the values used by the appointment message templates"""
+    _g = appointment_details.get
+    return {key: _g(key, default) for key, default in _TEMPLATE_KEYS}
+
 def send_email(to_email, subject, body, attachments=None):
     """
     Send an email with optional attachments
@@ -44,32 +267,34 @@ def send_email(to_email, subject, body, attachments=None):
         # Attach files if provided
         if attachments:
             for file_path in attachments:
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as file:
-                        part = MIMEApplication(file.read(), Name=os.path.basename(file_path))
-                    part['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
+                if os.path.isfile(file_path):
+                    name = os.path.basename(file_path)
+                    part = _attachment_part(file_path, name)
+                    part['Content-Disposition'] = f'attachment; filename="{name}"'
                     msg.attach(part)
                 else:
-                    logger.warning(f"Attachment file not found: {file_path}")
+                    logger.warning("Attachment file not found: %s", file_path)
         
         # Connect to server and send
-        if EMAIL_HOST and EMAIL_PORT and EMAIL_USERNAME and EMAIL_PASSWORD:
-            server = smtplib.SMTP(EMAIL_HOST, int(EMAIL_PORT))
-            server.starttls()
-            server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-            server.send_message(msg)
-            server.quit()
-            logger.info(f"Email sent to {to_email}: {subject}")
+        if _EMAIL_CONFIGURED:
+            try:
+                _get_smtp().send_message(msg)
+            except smtplib.SMTPException:
+                # The pooled connection may have gone stale; reconnect and retry once
+                _drop_smtp()
+                _get_smtp().send_message(msg)
+            logger.info("Email sent to %s: %s", to_email, subject)
             return True
         else:
             # If email settings are not configured, log the email instead
-            logger.info(f"[SIMULATED EMAIL] To: {to_email}, Subject: {subject}, Body: {body[:100]}...")
-            if attachments:
-                logger.info(f"[SIMULATED EMAIL] Attachments: {attachments}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[SIMULATED EMAIL] To: %s, Subject: %s, Body: %s...", to_email, subject, body[:100])
+                if attachments:
+                    logger.info("[SIMULATED EMAIL] Attachments: %s", attachments)
             return True
             
     except Exception as e:
-        logger.error(f"Failed to send email: {str(e)}")
+        logger.error("Failed to send email: %s", e)
         return False
 
 def send_sms(to_phone, message):
@@ -87,7 +312,7 @@ def send_sms(to_phone, message):
         # In a real implementation, we would use Twilio or another SMS service
         # For this demo, we'll just log the message
         
-        if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER:
+        if _TWILIO_CONFIGURED:
             # If this were a real implementation, we would use the Twilio SDK
             # client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
             # message = client.messages.create(
@@ -98,15 +323,15 @@ def send_sms(to_phone, message):
             # logger.info(f"SMS sent to {to_phone}: {message.sid}")
             
             # For now, just log it
-            logger.info(f"[TWILIO SMS] From: {TWILIO_PHONE_NUMBER}, To: {to_phone}, Message: {message}")
+            logger.info("[TWILIO SMS] From: %s, To: %s, Message: %s", TWILIO_PHONE_NUMBER, to_phone, message)
             return True
         else:
             # If Twilio settings are not configured, log the SMS instead
-            logger.info(f"[SIMULATED SMS] To: {to_phone}, Message: {message}")
+            logger.info("[SIMULATED SMS] To: %s, Message: %s", to_phone, message)
             return True
             
     except Exception as e:
-        logger.error(f"Failed to send SMS: {str(e)}")
+        logger.error("Failed to send SMS: %s", e)
         return False
 
 def send_appointment_confirmation(patient_email, patient_phone, appointment_details):
@@ -121,40 +346,34 @@ def send_appointment_confirmation(patient_email, patient_phone, appointment_deta
     Returns:
         tuple: (email_success, sms_success)
     """
-    # Format appointment date and time
-    appointment_date = appointment_details.get('appointment_date')
-    appointment_time = appointment_details.get('appointment_time')
-    doctor_name = appointment_details.get('doctor_name')
-    
-    # Email confirmation
-    subject = "Your Medical Appointment Confirmation"
-    email_body = f"""
-    <html>
-    <body>
-        <h2>Appointment Confirmation</h2>
-        <p>Dear {appointment_details.get('patient_name')},</p>
-        <p>Your appointment has been scheduled successfully:</p>
-        <ul>
-            <li><strong>Date:</strong> {appointment_date}</li>
-            <li><strong>Time:</strong> {appointment_time}</li>
-            <li><strong>Doctor:</strong> {doctor_name}</li>
-            <li><strong>Location:</strong> {appointment_details.get('location', 'Main Clinic')}</li>
-        </ul>
-        <p>Please arrive 15 minutes before your scheduled appointment time.</p>
-        <p>If you need to reschedule or cancel, please contact us at least 24 hours in advance.</p>
-        <p>Thank you for choosing our medical practice.</p>
-    </body>
-    </html>
-    """
+    fields = _template_fields(appointment_details)
     
-    # SMS confirmation
-    sms_message = f"Appointment confirmed with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
+    # Email and SMS confirmation
+    email_body = _CONFIRMATION_EMAIL.format_map(fields)
+    sms_message = _CONFIRMATION_SMS.format_map(fields)
     
     # Send notifications
-    email_success = send_email(patient_email, subject, email_body)
-    sms_success = send_sms(patient_phone, sms_message)
+    return _send_email_and_sms(patient_email, _CONFIRMATION_SUBJECT, email_body, patient_phone, sms_message)
+
+@functools.lru_cache(maxsize=1024)
+def _render_reminder(reminder_type, patient_name, appointment_date, appointment_time, doctor_name, location):
+    """
+    Render a reminder, cached so batch jobs reuse messages for repeated details
+    
+    Returns:
+        tuple: (subject, email_body, sms_message)
+    """
+    # Determine reminder message based on type
+    subject, email_template, sms_template = _REMINDER_TABLE.get(reminder_type, _DEFAULT_REMINDER)
     
-    return (email_success, sms_success)
+    fields = {
+        'patient_name': patient_name,
+        'appointment_date': appointment_date,
+        'appointment_time': appointment_time,
+        'doctor_name': doctor_name,
+        'location': location
+    }
+    return subject, email_template.format_map(fields), sms_template.format_map(fields)
 
 def send_appointment_reminder(patient_email, patient_phone, appointment_details, reminder_type):
     """
@@ -169,118 +388,10 @@ def send_appointment_reminder(patient_email, patient_phone, appointment_details,
     Returns:
         tuple: (email_success, sms_success)
     """
-    # Format appointment date and time
-    appointment_date = appointment_details.get('appointment_date')
-    appointment_time = appointment_details.get('appointment_time')
-    doctor_name = appointment_details.get('doctor_name')
-    patient_name = appointment_details.get('patient_name')
-    
-    # Determine reminder message based on type
-    if reminder_type == '7-day':
-        # First reminder - just a simple reminder
-        subject = "Upcoming Appointment Reminder"
-        email_body = f"""
-        <html>
-        <body>
-            <h2>Appointment Reminder</h2>
-            <p>Dear {patient_name},</p>
-            <p>This is a friendly reminder about your upcoming appointment:</p>
-            <ul>
-                <li><strong>Date:</strong> {appointment_date}</li>
-                <li><strong>Time:</strong> {appointment_time}</li>
-                <li><strong>Doctor:</strong> {doctor_name}</li>
-                <li><strong>Location:</strong> {appointment_details.get('location', 'Main Clinic')}</li>
-            </ul>
-            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
-            <p>If you need to reschedule or cancel, please contact us at least 24 hours in advance.</p>
-            <p>Thank you for choosing our medical practice.</p>
-        </body>
-        </html>
-        """
-        
-        sms_message = f"Reminder: You have an appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
-    
-    elif reminder_type == '3-day':
-        # Second reminder - ask about forms
-        subject = "Important: Appointment Forms Reminder"
-        email_body = f"""
-        <html>
-        <body>
-            <h2>Appointment Reminder</h2>
-            <p>Dear {patient_name},</p>
-            <p>Your appointment is coming up soon:</p>
-            <ul>
-                <li><strong>Date:</strong> {appointment_date}</li>
-                <li><strong>Time:</strong> {appointment_time}</li>
-                <li><strong>Doctor:</strong> {doctor_name}</li>
-                <li><strong>Location:</strong> {appointment_details.get('location', 'Main Clinic')}</li>
-            </ul>
-            <p><strong>Have you completed your intake forms?</strong> If not, please complete them before your appointment to save time.</p>
-            <p><strong>Is your appointment still confirmed?</strong> Please reply to confirm or call us to reschedule.</p>
-            <p>Thank you for choosing our medical practice.</p>
-        </body>
-        </html>
-        """
-        
-        sms_message = f"Reminder: Appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Have you completed your forms? Is your appointment confirmed? Reply Y to confirm or call to reschedule."
-    
-    elif reminder_type == '1-day':
-        # Final reminder - ask about forms and confirmation
-        subject = "FINAL REMINDER: Your Appointment Tomorrow"
-        email_body = f"""
-        <html>
-        <body>
-            <h2>Final Appointment Reminder</h2>
-            <p>Dear {patient_name},</p>
-            <p>This is your final reminder about your appointment tomorrow:</p>
-            <ul>
-                <li><strong>Date:</strong> {appointment_date}</li>
-                <li><strong>Time:</strong> {appointment_time}</li>
-                <li><strong>Doctor:</strong> {doctor_name}</li>
-                <li><strong>Location:</strong> {appointment_details.get('location', 'Main Clinic')}</li>
-            </ul>
-            <p><strong>Important:</strong></p>
-            <ol>
-                <li>Have you completed your intake forms? If not, please do so immediately.</li>
-                <li>Is your appointment confirmed? If you need to cancel, please let us know immediately.</li>
-                <li>If you need to cancel, please provide a reason so we can better assist you.</li>
-            </ol>
-            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
-            <p>Thank you for choosing our medical practice.</p>
-        </body>
-        </html>
-        """
-        
-        sms_message = f"FINAL REMINDER: Appointment tomorrow with Dr. {doctor_name} at {appointment_time}. Have you completed your forms? Is your appointment confirmed? If you need to cancel, please provide a reason. Reply Y to confirm."
-    
-    else:
-        # Generic reminder
-        subject = "Appointment Reminder"
-        email_body = f"""
-        <html>
-        <body>
-            <h2>Appointment Reminder</h2>
-            <p>Dear {patient_name},</p>
-            <p>This is a reminder about your upcoming appointment:</p>
-            <ul>
-                <li><strong>Date:</strong> {appointment_date}</li>
-                <li><strong>Time:</strong> {appointment_time}</li>
-                <li><strong>Doctor:</strong> {doctor_name}</li>
-                <li><strong>Location:</strong> {appointment_details.get('location', 'Main Clinic')}</li>
-            </ul>
-            <p>Please arrive 15 minutes before your scheduled appointment time.</p>
-            <p>Thank you for choosing our medical practice.</p>
-        </body>
-        </html>
-        """
-        
-        sms_message = f"Reminder: You have an appointment with Dr. {doctor_name} on {appointment_date} at {appointment_time}. Reply Y to confirm or call to reschedule."
+    subject, email_body, sms_message = _render_reminder(reminder_type, **_template_fields(appointment_details))
     
     # Send notifications
-    email_success = send_email(patient_email, subject, email_body)
-    sms_success = send_sms(patient_phone, sms_message)
-    
-    return (email_success, sms_success)
+    return _send_email_and_sms(patient_email, subject, email_body, patient_phone, sms_message)
 
 def send_intake_forms(patient_email, patient_name, form_files):
     """
@@ -294,25 +405,47 @@ def send_intake_forms(patient_email, patient_name, form_files):
     Returns:
         bool: True if email was sent successfully, False otherwise
     """
-    subject = "Important: Your Medical Intake Forms"
-    email_body = f"""
-    <html>
-    <body>
-        <h2>Medical Intake Forms</h2>
-        <p>Dear {patient_name},</p>
-        <p>Please find attached the intake forms for your upcoming appointment.</p>
-        <p><strong>Instructions:</strong></p>
-        <ol>
-            <li>Please complete all forms prior to your appointment.</li>
-            <li>Bring the completed forms with you or email them back to us.</li>
-            <li>If you have any questions about the forms, please contact our office.</li>
-        </ol>
-        <p>Thank you for choosing our medical practice.</p>
-    </body>
-    </html>
+    email_body = _INTAKE_FORMS_EMAIL.format_map({'patient_name': patient_name})
+    return send_email(patient_email, _INTAKE_FORMS_SUBJECT, email_body, attachments=form_files)
+
+def _default_export_path(prefix):
+    """Build a timestamped path in the data/exports directory"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'exports')
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f"{prefix}_{timestamp}.xlsx")
+
+def write_appointments_workbook(appointment_list, output_path=None):
     """
+    Export several appointments to a single Excel file for admin review
+    
+    Args:
+        appointment_list (list): List of dictionaries with appointment details
+        output_path (str, optional): Path to save the Excel file
     
-    return send_email(patient_email, subject, email_body, attachments=form_files)
+    Returns:
+        str: Path to the saved Excel file
+    """
+    # Generate output path if not provided
+    if not output_path:
+        output_path = _default_export_path("appointments")
+    
+    # Columns in order of first appearance, as a DataFrame would build them
+    columns = list(dict.fromkeys(key for details in appointment_list for key in details))
+    
+    # Imported lazily so notification-only callers don't load openpyxl
+    from openpyxl import Workbook
+    
+    # Export to Excel, streaming rows through a write-only workbook
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    worksheet.append(columns)
+    for details in appointment_list:
+        worksheet.append([details.get(column) for column in columns])
+    workbook.save(output_path)
+    logger.info("Exported %d appointments to %s", len(appointment_list), output_path)
+    
+    return output_path
 
 def export_appointment_to_excel(appointment_details, output_path=None):
     """
@@ -325,18 +458,8 @@ def export_appointment_to_excel(appointment_details, output_path=None):
     Returns:
         str: Path to the saved Excel file
     """
-    # Convert appointment details to DataFrame
-    df = pd.DataFrame([appointment_details])
-    
     # Generate output path if not provided
     if not output_path:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'exports')
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"appointment_{timestamp}.xlsx")
-    
-    # Export to Excel
-    df.to_excel(output_path, index=False)
-    logger.info(f"Exported appointment details to {output_path}")
+        output_path = _default_export_path("appointment")
     
-    return output_path
\ No newline at end of file
+    return write_appointments_workbook([appointment_details], output_path)
\ No newline at end of file
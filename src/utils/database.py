@@ -1,20 +1,77 @@
 import sqlite3
 import os
-import pandas as pd
-from datetime import datetime
+import itertools
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
 import logging
 from ..config import DATABASE_PATH
 from ..models.patient import Patient
 
 logger = logging.getLogger(__name__)
 
-def get_db_connection():
+# WAL journal mode is persistent per database file, so it only needs to be set once
+_wal_enabled = False
+
+def _enable_wal(conn):
+    """
+    Switch the database file to WAL journal mode (once per process)
+    """
+    global _wal_enabled
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+
+# One connection per thread, reused across calls instead of reopened each time
+_CONNECTION_POOL = threading.local()
+
+class _PooledConnection:
     """
-    Create a connection to the SQLite database
+    Holds a thread's connection in the thread-local pool. The holder is dropped with the
+    thread's locals when the thread exits, and its finalizer then closes the connection
+    (finalizers still pending at interpreter exit run then).
     """
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    conn = sqlite3.connect(DATABASE_PATH)
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn):
+        self.conn = conn
+        weakref.finalize(self, conn.close)
+
+def _open_connection():
+    """
+    Open and configure a new connection to the SQLite database
+    """
+    # Only the owning thread uses the connection, but the finalizer that closes it
+    # may run on another thread once the owner has exited
+    conn = sqlite3.connect(DATABASE_PATH, cached_statements=256, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    
+    # Per-connection tuning; WAL makes synchronous=NORMAL safe and skips the fsync per commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=134217728")
+    conn.execute("PRAGMA busy_timeout=5000")
+    _enable_wal(conn)
+    return conn
+
+def get_db_connection():
+    """
+    Get this thread's connection to the SQLite database, opening it on first use
+    """
+    pooled = getattr(_CONNECTION_POOL, 'pooled', None)
+    if pooled is not None:
+        try:
+            # Raises ProgrammingError if the connection has been closed
+            pooled.conn.in_transaction
+            return pooled.conn
+        except sqlite3.ProgrammingError:
+            pass
+    
+    conn = _open_connection()
+    _CONNECTION_POOL.pooled = _PooledConnection(conn)
     return conn
 
 def initialize_database():
@@ -112,41 +169,129 @@ def initialize_database():
     )
     ''')
     
+    # Create doctor availability table (filled by the synthetic data generator)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS doctor_availability (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        doctor_id INTEGER NOT NULL,
+        available_date TEXT NOT NULL,
+        slot_time TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (doctor_id) REFERENCES doctors (id)
+    )
+    ''')
+    
+    # Indexes for the hot lookups: patient search, doctor availability and per-patient/appointment joins
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_patients_name_dob
+    ON patients (LOWER(last_name), LOWER(first_name), date_of_birth)
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_appts_doctor_date
+    ON appointments (doctor_id, appointment_date, status)
+    ''')
+    # One insurance record per patient; also the conflict target for save_insurance_info's upsert
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_insurance_patient ON insurance (patient_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_forms_patient ON forms (patient_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_appt ON reminders (appointment_id)")
+    
     conn.commit()
-    conn.close()
     logger.info("Database initialized successfully")
 
+# Schema creation runs once per process, on the first ensure_schema() call
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def ensure_schema():
+    """
+    Create the database schema if it hasn't been created by this process yet
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            # The database directory only has to exist before the first connection opens the file
+            os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+            initialize_database()
+            _schema_ready = True
+
+def analyze_database():
+    """
+    Refresh the query planner statistics, run once after seeding data
+    """
+    conn = get_db_connection()
+    conn.execute("ANALYZE")
+    conn.commit()
+
+def has_seed_data():
+    """
+    Check whether doctors have already been loaded (the same check load_synthetic_data uses)
+    """
+    conn = get_db_connection()
+    return bool(conn.execute("SELECT EXISTS (SELECT 1 FROM doctors)").fetchone()[0])
+
+@contextmanager
+def seed_transaction():
+    """
+    Run several bulk writes as one transaction, so a failure part-way leaves none of their rows behind
+    """
+    conn = get_db_connection()
+    conn.execute("BEGIN")
+    with conn:
+        yield conn
+
+def _transaction(conn):
+    """
+    Commit on success and roll back on error, or join the transaction seed_transaction already opened
+    """
+    return nullcontext() if conn.in_transaction else conn
+
+def _insert_many(conn, query, rows):
+    """
+    Insert rows with executemany in one transaction and return their new IDs
+    """
+    with _transaction(conn):
+        conn.executemany(query, rows)
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    
+    # Rowids assigned within one write transaction are consecutive, ending at last_insert_rowid()
+    return list(range(last_id - len(rows) + 1, last_id + 1)) if rows else []
+
+# WHERE conditions for find_patient, in (patient_id, first_name, last_name, date_of_birth) order
+_PATIENT_FILTERS = (
+    "id = ?",
+    "LOWER(first_name) = LOWER(?)",
+    "LOWER(last_name) = LOWER(?)",
+    "date_of_birth = ?"
+)
+
+# Fixed query text for every combination of find_patient filters, keyed by which are set,
+# so the connection's statement cache always reuses the prepared statement
+_FIND_PATIENT_SQL = {
+    mask: "SELECT * FROM patients WHERE " + " AND ".join(
+        condition for condition, used in zip(_PATIENT_FILTERS, mask) if used
+    )
+    for mask in itertools.product((False, True), repeat=len(_PATIENT_FILTERS))
+    if any(mask)
+}
+
 def find_patient(first_name=None, last_name=None, date_of_birth=None, patient_id=None):
     """
     Find a patient in the database based on provided criteria
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    values = (patient_id, first_name, last_name, date_of_birth)
+    mask = tuple(bool(value) for value in values)
     
-    query = "SELECT * FROM patients WHERE "
-    conditions = []
-    params = []
-    
-    if patient_id:
-        conditions.append("id = ?")
-        params.append(patient_id)
-    if first_name:
-        conditions.append("LOWER(first_name) = LOWER(?)")
-        params.append(first_name)
-    if last_name:
-        conditions.append("LOWER(last_name) = LOWER(?)")
-        params.append(last_name)
-    if date_of_birth:
-        conditions.append("date_of_birth = ?")
-        params.append(date_of_birth)
-    
-    if not conditions:
+    if not any(mask):
         return None
     
-    query += " AND ".join(conditions)
-    cursor.execute(query, params)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    params = [value for value in values if value]
+    cursor.execute(_FIND_PATIENT_SQL[mask], params)
     patient = cursor.fetchone()
-    conn.close()
     
     return dict(patient) if patient else None
 
@@ -157,21 +302,108 @@ def create_patient(first_name, last_name, date_of_birth, email=None, phone=None,
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
+    with conn:
+        cursor.execute('''
+        INSERT INTO patients (first_name, last_name, date_of_birth, email, phone, address)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (first_name, last_name, date_of_birth, email, phone, address))
+        
+        patient_id = cursor.lastrowid
+    
+    logger.info(f"Created new patient with ID: {patient_id}")
+    return patient_id
+
+def create_patient_rows_bulk(rows):
+    """
+    Create patient records from (first_name, last_name, date_of_birth, email, phone, address)
+    tuples in a single transaction
+    """
+    conn = get_db_connection()
+    
+    patient_ids = _insert_many(conn, '''
     INSERT INTO patients (first_name, last_name, date_of_birth, email, phone, address)
     VALUES (?, ?, ?, ?, ?, ?)
-    ''', (first_name, last_name, date_of_birth, email, phone, address))
+    ''', rows)
     
-    patient_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    logger.info(f"Created {len(patient_ids)} patients")
+    return patient_ids
+
+def create_doctors_bulk(doctors):
+    """
+    Create doctor records for several doctors in a single transaction
+    """
+    conn = get_db_connection()
     
-    logger.info(f"Created new patient with ID: {patient_id}")
-    return patient_id
+    rows = [
+        (doctor.first_name, doctor.last_name, doctor.specialty, doctor.email, doctor.phone)
+        for doctor in doctors
+    ]
+    doctor_ids = _insert_many(conn, '''
+    INSERT INTO doctors (first_name, last_name, specialty, email, phone)
+    VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+    
+    for doctor, doctor_id in zip(doctors, doctor_ids):
+        doctor.id = doctor_id
+    
+    logger.info(f"Created {len(doctor_ids)} doctors")
+    return doctor_ids
+
+def add_doctor_availability(doctor_id, date, slots):
+    """
+    Record a doctor's available slots for a date in a single transaction
+    """
+    add_doctor_availability_bulk([(doctor_id, date, slot) for slot in slots])
+
+def add_doctor_availability_bulk(rows):
+    """
+    Record (doctor_id, date, slot) availability rows, across any doctors and dates, in a single transaction
+    """
+    conn = get_db_connection()
+    
+    with _transaction(conn):
+        conn.executemany('''
+        INSERT INTO doctor_availability (doctor_id, available_date, slot_time)
+        VALUES (?, ?, ?)
+        ''', rows)
+
+# Working hours (9 AM to 5 PM) split into 30-minute slots
+_WORKING_HOURS = (9, 17)
+_ALL_SLOTS = tuple(
+    f"{hour:02d}:{minute:02d}"
+    for hour in range(*_WORKING_HOURS)
+    for minute in (0, 30)
+)
+_FIRST_SLOT_INDEX = _WORKING_HOURS[0] * 2
+
+def _mark_booked(booked, appointment_time, duration):
+    """
+    Add the half-hour slot indexes (hour * 2 + minute // 30) taken by an appointment to booked
+    """
+    # Convert time string to hour and minute
+    hour, minute = map(int, appointment_time.split(':'))
+    
+    # Only appointments starting on a half hour line up with the slot grid
+    if minute % 30:
+        return
+    
+    # Mark every 30-minute slot this appointment takes
+    start = hour * 2 + minute // 30
+    booked.update(range(start, start + duration // 30))
+
+def _free_slots(booked):
+    """
+    Get the working-hour slots whose indexes are not in booked
+    """
+    # Nothing booked: hand back the shared, immutable slot tuple without copying it
+    if not booked:
+        return _ALL_SLOTS
+    
+    return tuple(slot for index, slot in enumerate(_ALL_SLOTS, _FIRST_SLOT_INDEX) if index not in booked)
 
 def get_doctor_availability(doctor_id, date):
     """
-    Get a doctor's availability for a specific date
+    Get a doctor's availability for a specific date, as a tuple of "HH:MM" slots
     """
     # In a real implementation, this would query the doctor's schedule
     # For this demo, we'll use a simple approach with fixed hours
@@ -186,44 +418,39 @@ def get_doctor_availability(doctor_id, date):
     WHERE doctor_id = ? AND appointment_date = ? AND status != 'cancelled'
     ''', (doctor_id, date))
     
-    booked_slots = cursor.fetchall()
-    conn.close()
+    # Remove booked slots
+    booked = set()
+    for appointment_time, duration in cursor:
+        _mark_booked(booked, appointment_time, duration)
     
-    # Define working hours (9 AM to 5 PM)
-    working_hours = {
-        'start': 9,  # 9 AM
-        'end': 17    # 5 PM
-    }
+    return _free_slots(booked)
+
+def get_availability_for_doctors(doctor_ids, date):
+    """
+    Get several doctors' availability for a specific date with a single query
     
-    # Generate all possible time slots (30-minute intervals)
-    all_slots = []
-    for hour in range(working_hours['start'], working_hours['end']):
-        for minute in [0, 30]:
-            time_str = f"{hour:02d}:{minute:02d}"
-            all_slots.append(time_str)
+    Returns a dict mapping each doctor ID to a tuple of "HH:MM" slots
+    """
+    doctor_ids = list(doctor_ids)
+    if not doctor_ids:
+        return {}
     
-    # Remove booked slots
-    available_slots = all_slots.copy()
-    for appointment in booked_slots:
-        time_str = appointment['appointment_time']
-        duration = appointment['duration']
-        
-        # Convert time string to hour and minute
-        hour, minute = map(int, time_str.split(':'))
-        
-        # Calculate how many 30-minute slots this appointment takes
-        num_slots = duration // 30
-        
-        # Remove all affected slots
-        for i in range(num_slots):
-            slot_hour = hour + (minute + i * 30) // 60
-            slot_minute = (minute + i * 30) % 60
-            slot = f"{slot_hour:02d}:{slot_minute:02d}"
-            
-            if slot in available_slots:
-                available_slots.remove(slot)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    placeholders = ",".join("?" * len(doctor_ids))
+    cursor.execute(f'''
+    SELECT doctor_id, appointment_time, duration 
+    FROM appointments 
+    WHERE appointment_date = ? AND doctor_id IN ({placeholders}) AND status != 'cancelled'
+    ''', (date, *doctor_ids))
     
-    return available_slots
+    # Group booked slots per doctor
+    booked_per_doctor = defaultdict(set)
+    for doctor_id, appointment_time, duration in cursor:
+        _mark_booked(booked_per_doctor[doctor_id], appointment_time, duration)
+    
+    return {doctor_id: _free_slots(booked_per_doctor.get(doctor_id)) for doctor_id in doctor_ids}
 
 def create_appointment(patient_id, doctor_id, appointment_date, appointment_time, duration, notes=None):
     """
@@ -232,14 +459,13 @@ def create_appointment(patient_id, doctor_id, appointment_date, appointment_time
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-    INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, duration, notes)
-    VALUES (?, ?, ?, ?, ?, ?)
-    ''', (patient_id, doctor_id, appointment_date, appointment_time, duration, notes))
-    
-    appointment_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor.execute('''
+        INSERT INTO appointments (patient_id, doctor_id, appointment_date, appointment_time, duration, notes)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (patient_id, doctor_id, appointment_date, appointment_time, duration, notes))
+        
+        appointment_id = cursor.lastrowid
     
     logger.info(f"Created new appointment with ID: {appointment_id}")
     return appointment_id
@@ -251,28 +477,21 @@ def save_insurance_info(patient_id, carrier, member_id, group_id=None):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Check if insurance info already exists for this patient
-    cursor.execute("SELECT id FROM insurance WHERE patient_id = ?", (patient_id,))
-    existing = cursor.fetchone()
-    
-    if existing:
-        # Update existing record
-        cursor.execute('''
-        UPDATE insurance 
-        SET carrier = ?, member_id = ?, group_id = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE patient_id = ?
-        ''', (carrier, member_id, group_id, patient_id))
-        insurance_id = existing['id']
-    else:
-        # Create new record
+    with conn:
+        # Insert, or update the patient's existing record in the same statement
         cursor.execute('''
         INSERT INTO insurance (patient_id, carrier, member_id, group_id)
         VALUES (?, ?, ?, ?)
+        ON CONFLICT (patient_id) DO UPDATE SET
+            carrier = excluded.carrier,
+            member_id = excluded.member_id,
+            group_id = excluded.group_id,
+            updated_at = CURRENT_TIMESTAMP
         ''', (patient_id, carrier, member_id, group_id))
-        insurance_id = cursor.lastrowid
-    
-    conn.commit()
-    conn.close()
+        
+        # lastrowid isn't set when the upsert updates, so look the record up
+        cursor.execute("SELECT id FROM insurance WHERE patient_id = ?", (patient_id,))
+        insurance_id = cursor.fetchone()['id']
     
     logger.info(f"Saved insurance info for patient ID: {patient_id}")
     return insurance_id
@@ -289,28 +508,24 @@ def schedule_reminders(appointment_id, reminder_days):
     appointment = cursor.fetchone()
     
     if not appointment:
-        conn.close()
         logger.error(f"Appointment with ID {appointment_id} not found")
         return False
     
     appointment_date = datetime.strptime(appointment['appointment_date'], "%Y-%m-%d")
     
-    # Schedule reminders for each day in reminder_days
-    reminder_ids = []
+    # Build every reminder row up front
+    reminder_time = " 09:00"  # Send reminders at 9 AM
+    rows = []
     for days in reminder_days:
-        reminder_date = appointment_date - pd.Timedelta(days=days)
-        reminder_time = "09:00"  # Send reminders at 9 AM
-        scheduled_time = f"{reminder_date.strftime('%Y-%m-%d')} {reminder_time}"
-        
-        cursor.execute('''
-        INSERT INTO reminders (appointment_id, reminder_type, scheduled_time)
-        VALUES (?, ?, ?)
-        ''', (appointment_id, f"{days}-day", scheduled_time))
-        
-        reminder_ids.append(cursor.lastrowid)
+        reminder_date = appointment_date - timedelta(days=days)
+        scheduled_time = reminder_date.date().isoformat() + reminder_time
+        rows.append((appointment_id, f"{days}-day", scheduled_time))
     
-    conn.commit()
-    conn.close()
+    # Insert them in one transaction
+    reminder_ids = _insert_many(conn, '''
+    INSERT INTO reminders (appointment_id, reminder_type, scheduled_time)
+    VALUES (?, ?, ?)
+    ''', rows)
     
     logger.info(f"Scheduled {len(reminder_ids)} reminders for appointment ID: {appointment_id}")
     return reminder_ids
@@ -348,19 +563,26 @@ def export_appointments_to_excel(output_path=None):
     ORDER BY a.appointment_date, a.appointment_time
     '''
     
-    # Read query results into a pandas DataFrame
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    
     # Generate output path if not provided
     if not output_path:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = f"appointments_export_{timestamp}.xlsx"
     
-    # Export to Excel
-    df.to_excel(output_path, index=False)
-    
-    logger.info(f"Exported {len(df)} appointments to {output_path}")
+    # Imported lazily so callers that never export don't load openpyxl
+    from openpyxl import Workbook
+    
+    # Stream rows from the cursor into a write-only workbook, so memory stays flat
+    cursor = conn.execute(query)
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    worksheet.append([column[0] for column in cursor.description])
+    row_count = 0
+    for row in cursor:
+        worksheet.append(tuple(row))
+        row_count += 1
+    workbook.save(output_path)
+    
+    logger.info(f"Exported {row_count} appointments to {output_path}")
     return output_path
 
 def load_synthetic_data():
@@ -370,31 +592,30 @@ def load_synthetic_data():
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Check if we already have data
-    cursor.execute("SELECT COUNT(*) as count FROM doctors")
-    doctor_count = cursor.fetchone()['count']
-    
-    if doctor_count > 0:
-        conn.close()
-        logger.info("Synthetic data already loaded")
-        return
-    
-    # Insert sample doctors
-    doctors = [
-        ('John', 'Smith', 'Family Medicine', 'john.smith@example.com', '555-123-4567'),
-        ('Sarah', 'Johnson', 'Pediatrics', 'sarah.johnson@example.com', '555-234-5678'),
-        ('Michael', 'Williams', 'Cardiology', 'michael.williams@example.com', '555-345-6789'),
-        ('Emily', 'Brown', 'Dermatology', 'emily.brown@example.com', '555-456-7890'),
-        ('David', 'Jones', 'Orthopedics', 'david.jones@example.com', '555-567-8901')
-    ]
-    
-    cursor.executemany('''
-    INSERT INTO doctors (first_name, last_name, specialty, email, phone)
-    VALUES (?, ?, ?, ?, ?)
-    ''', doctors)
+    with conn:
+        # Check if we already have data
+        cursor.execute("SELECT COUNT(*) as count FROM doctors")
+        doctor_count = cursor.fetchone()['count']
+        
+        if doctor_count > 0:
+            logger.info("Synthetic data already loaded")
+            return
+        
+        # Insert sample doctors
+        doctors = [
+            ('John', 'Smith', 'Family Medicine', 'john.smith@example.com', '555-123-4567'),
+            ('Sarah', 'Johnson', 'Pediatrics', 'sarah.johnson@example.com', '555-234-5678'),
+            ('Michael', 'Williams', 'Cardiology', 'michael.williams@example.com', '555-345-6789'),
+            ('Emily', 'Brown', 'Dermatology', 'emily.brown@example.com', '555-456-7890'),
+            ('David', 'Jones', 'Orthopedics', 'david.jones@example.com', '555-567-8901')
+        ]
+        
+        cursor.executemany('''
+        INSERT INTO doctors (first_name, last_name, specialty, email, phone)
+        VALUES (?, ?, ?, ?, ?)
+        ''', doctors)
     
-    conn.commit()
-    conn.close()
+    analyze_database()
     
     logger.info("Loaded synthetic doctor data")
     
@@ -402,7 +623,7 @@ def load_synthetic_data():
 
 def get_patient_by_name_dob(first_name, last_name, date_of_birth):
     """
-    Find a patient by name and date of birth
+    Find a patient by name (case-insensitive) and date of birth
     """
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -412,11 +633,10 @@ def get_patient_by_name_dob(first_name, last_name, date_of_birth):
     WHERE LOWER(first_name) = LOWER(?) AND LOWER(last_name) = LOWER(?) AND date_of_birth = ?
     """, (first_name, last_name, date_of_birth))
     
-    patient = cursor.fetchone()
-    conn.close()
+    row = cursor.fetchone()
     
-    if patient:
-        return dict(patient)
+    if row:
+        return Patient.from_dict(dict(row))
     return None
 
 def get_doctor_by_id(doctor_id):
@@ -428,7 +648,6 @@ def get_doctor_by_id(doctor_id):
     
     cursor.execute("SELECT * FROM doctors WHERE id = ?", (doctor_id,))
     doctor = cursor.fetchone()
-    conn.close()
     
     if doctor:
         return dict(doctor)
@@ -443,7 +662,20 @@ def get_patient_by_id(patient_id):
     
     cursor.execute("SELECT * FROM patients WHERE id = ?", (patient_id,))
     patient = cursor.fetchone()
-    conn.close()
+    
+    if patient:
+        return dict(patient)
+    return None
+
+def get_patient_name(patient_id):
+    """
+    Get only a patient's name by ID, for callers that don't need the full record
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT id, first_name, last_name FROM patients WHERE id = ?", (patient_id,))
+    patient = cursor.fetchone()
     
     if patient:
         return dict(patient)
@@ -462,21 +694,19 @@ def update_appointment_status(appointment_id, status, notes=None):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    if notes:
-        cursor.execute("""
-        UPDATE appointments 
-        SET status = ?, notes = ?, updated_at = CURRENT_TIMESTAMP 
-        WHERE id = ?
-        """, (status, notes, appointment_id))
-    else:
-        cursor.execute("""
-        UPDATE appointments 
-        SET status = ?, updated_at = CURRENT_TIMESTAMP 
-        WHERE id = ?
-        """, (status, appointment_id))
-    
-    conn.commit()
-    conn.close()
+    with conn:
+        if notes:
+            cursor.execute("""
+            UPDATE appointments 
+            SET status = ?, notes = ?, updated_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+            """, (status, notes, appointment_id))
+        else:
+            cursor.execute("""
+            UPDATE appointments 
+            SET status = ?, updated_at = CURRENT_TIMESTAMP 
+            WHERE id = ?
+            """, (status, appointment_id))
     
     logger.info(f"Updated appointment {appointment_id} status to {status}")
     return True
@@ -488,96 +718,97 @@ def create_form(patient_id, form_type):
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-    INSERT INTO forms (patient_id, form_type, sent_at)
-    VALUES (?, ?, CURRENT_TIMESTAMP)
-    """, (patient_id, form_type))
-    
-    form_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor.execute("""
+        INSERT INTO forms (patient_id, form_type, sent_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        """, (patient_id, form_type))
+        
+        form_id = cursor.lastrowid
     
     logger.info(f"Created form {form_type} for patient {patient_id}")
     return form_id
 
-def export_appointment_to_excel(appointment_id, output_path=None):
+def create_forms_bulk(forms):
     """
-    Export a specific appointment to Excel
+    Create form records for several forms in a single transaction
     """
     conn = get_db_connection()
     
-    # Query to get appointment details with patient and doctor information
-    query = f"""
-    SELECT 
-        a.id as appointment_id,
-        a.appointment_date,
-        a.appointment_time,
-        a.duration,
-        a.status,
-        a.notes,
-        p.first_name as patient_first_name,
-        p.last_name as patient_last_name,
-        p.date_of_birth as patient_dob,
-        p.email as patient_email,
-        p.phone as patient_phone,
-        d.first_name as doctor_first_name,
-        d.last_name as doctor_last_name,
-        d.specialty as doctor_specialty,
-        i.carrier as insurance_carrier,
-        i.member_id as insurance_member_id,
-        i.group_id as insurance_group_id
-    FROM appointments a
-    JOIN patients p ON a.patient_id = p.id
-    JOIN doctors d ON a.doctor_id = d.id
-    LEFT JOIN insurance i ON p.id = i.patient_id
-    WHERE a.id = {appointment_id}
-    """
+    # One transaction for the whole batch, rolled back if any row fails
+    form_ids = _insert_many(conn, """
+    INSERT INTO forms (patient_id, form_type, status, sent_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    """, [(form.patient_id, form.form_type, form.status) for form in forms])
     
-    # Read query results into a pandas DataFrame
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    for form, form_id in zip(forms, form_ids):
+        form.id = form_id
     
-    # Generate output path if not provided
-    if not output_path:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"appointment_{appointment_id}_{timestamp}.xlsx"
+    logger.info(f"Created {len(forms)} forms")
+    return forms
+
+# Appointment details with patient and doctor information for a single appointment
+_EXPORT_ONE_SQL = """
+SELECT 
+    a.id as appointment_id,
+    a.appointment_date,
+    a.appointment_time,
+    a.duration,
+    a.status,
+    a.notes,
+    p.first_name as patient_first_name,
+    p.last_name as patient_last_name,
+    p.date_of_birth as patient_dob,
+    p.email as patient_email,
+    p.phone as patient_phone,
+    d.first_name as doctor_first_name,
+    d.last_name as doctor_last_name,
+    d.specialty as doctor_specialty,
+    i.carrier as insurance_carrier,
+    i.member_id as insurance_member_id,
+    i.group_id as insurance_group_id
+FROM appointments a
+JOIN patients p ON a.patient_id = p.id
+JOIN doctors d ON a.doctor_id = d.id
+LEFT JOIN insurance i ON p.id = i.patient_id
+WHERE a.id = ?
+"""
+
+def get_appointment_details(appointment_id):
+    """
+    Get an appointment with its patient, doctor and insurance details
+    """
+    conn = get_db_connection()
     
-    # Export to Excel
-    df.to_excel(output_path, index=False)
+    details = conn.execute(_EXPORT_ONE_SQL, (appointment_id,)).fetchone()
     
-    logger.info(f"Exported appointment {appointment_id} to {output_path}")
-    return output_path
+    if details:
+        return dict(details)
+    return None
 
-def get_patient_by_name_dob(first_name, last_name, date_of_birth):
+def export_appointment_to_excel(appointment_id, output_path=None):
     """
-    Get a patient by name and date of birth
+    Export a specific appointment to Excel
     """
     conn = get_db_connection()
-    cursor = conn.cursor()
     
-    query = """
-    SELECT * FROM patients 
-    WHERE first_name = ? AND last_name = ? AND date_of_birth = ?
-    """
+    cursor = conn.execute(_EXPORT_ONE_SQL, (appointment_id,))
     
-    cursor.execute(query, (first_name, last_name, date_of_birth))
-    row = cursor.fetchone()
+    # Generate output path if not provided
+    if not output_path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = f"appointment_{appointment_id}_{timestamp}.xlsx"
     
-    if row:
-        patient = Patient(
-            id=row['id'],
-            first_name=row['first_name'],
-            last_name=row['last_name'],
-            date_of_birth=row['date_of_birth'],
-            email=row['email'],
-            phone=row['phone'],
-            address=row['address']
-        )
-        conn.close()
-        return patient
-    
-    conn.close()
-    return None
-
-# Initialize the database when this module is imported
-initialize_database()
\ No newline at end of file
+    # Imported lazily so callers that never export don't load openpyxl
+    from openpyxl import Workbook
+    
+    # Export to Excel, writing the header and matching rows directly
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    worksheet.append([column[0] for column in cursor.description])
+    for row in cursor:
+        worksheet.append(tuple(row))
+    workbook.save(output_path)
+    
+    logger.info(f"Exported appointment {appointment_id} to {output_path}")
+    return output_path
\ No newline at end of file
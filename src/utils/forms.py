@@ -4,11 +4,12 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Directory holding the intake form files sent to patients
+FORMS_DIR = Path(__file__).parent.parent.parent / 'data' / 'forms'
+
 def create_sample_forms():
     """Create sample form files for the application"""
-    # Get the forms directory
-    base_dir = Path(__file__).parent.parent.parent
-    forms_dir = base_dir / 'data' / 'forms'
+    forms_dir = FORMS_DIR
     
     # Create the directory if it doesn't exist
     forms_dir.mkdir(parents=True, exist_ok=True)
@@ -123,14 +124,15 @@ def create_sample_forms():
         """
     }
     
+    # List the directory once instead of checking each form separately
+    with os.scandir(forms_dir) as entries:
+        existing = {entry.name for entry in entries}
+    
     # Create each form file
     for filename, content in sample_forms.items():
-        file_path = forms_dir / filename
-        
         # Only create if it doesn't exist
-        if not file_path.exists():
-            with open(file_path, 'w') as f:
-                f.write(content)
+        if filename not in existing:
+            (forms_dir / filename).write_text(content)
             logger.info(f"Created sample form: {filename}")
         else:
             logger.info(f"Sample form already exists: {filename}")
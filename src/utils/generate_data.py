@@ -1,79 +1,118 @@
+import csv
 import os
+import sys
+import itertools
+from operator import attrgetter
 import random
 import logging
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
 
 from src.models.patient import Patient
 from src.models.appointment import Doctor
+from src.models.serialization import field_names
 from src.utils.database import (
-    initialize_database, 
-    create_patient, 
-    create_doctor,
-    add_doctor_availability
+    ensure_schema,
+    seed_transaction,
+    analyze_database,
+    create_patient_rows_bulk,
+    create_doctors_bulk,
+    add_doctor_availability_bulk
 )
 from src.utils.forms import create_sample_forms
 
 logger = logging.getLogger(__name__)
 
+# Value pools shared by the per-record helpers and the vectorized patient generator
+_FIRST_NAMES = (
+    "James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles",
+    "Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah", "Karen"
+)
+_LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Jones", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor",
+    "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson", "Garcia", "Martinez", "Robinson"
+)
+_EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com")
+_STREET_NAMES = ("Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill")
+_STREET_TYPES = ("St", "Ave", "Blvd", "Rd", "Ln", "Dr", "Way", "Pl", "Ct")
+_CITIES = ("Springfield", "Franklin", "Greenville", "Bristol", "Clinton", "Salem", "Madison", "Georgetown", "Arlington")
+_STATES = ("CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI")
+_STREET_NUMBER_RANGE = (100, 10000)
+_CARRIERS = ("Blue Cross", "Aetna", "UnitedHealthcare", "Cigna", "Humana", "Kaiser", "Medicare", "Medicaid")
+_MEMBER_ID_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_SPECIALTIES = (
+    "Family Medicine", "Internal Medicine", "Pediatrics", "Cardiology",
+    "Dermatology", "Neurology", "Orthopedics", "Psychiatry", "Obstetrics"
+)
+
+# Interned fragments shared by every generated email and address, so repeated pool values
+# are concatenated from the same string objects instead of being re-formatted per record
+_EMAIL_SUFFIXES = tuple(sys.intern("@" + domain) for domain in _EMAIL_DOMAINS)
+_LOWER_NAMES = {name: sys.intern(name.lower()) for name in _FIRST_NAMES + _LAST_NAMES}
+_STREET_PHRASES = tuple(
+    sys.intern(f" {street_name} {street_type}, ")
+    for street_name, street_type in itertools.product(_STREET_NAMES, _STREET_TYPES)
+)
+_CITY_STATES = tuple(sys.intern(f"{city}, {state} ") for city, state in itertools.product(_CITIES, _STATES))
+
+# Working hours: 9 AM to 5 PM (last appointment starts at 4 PM)
+_WORKING_HOURS = range(9, 17)
+# Half-hour slot labels indexed by (hour - 9) * 2 + half, without 4:30 PM
+_SLOT_STRINGS = tuple(f"{hour:02d}:{minute:02d}" for hour in _WORKING_HOURS for minute in (0, 30))[:-1]
+
+# Generators shared by every helper in this module, reseeded by generate_synthetic_data(seed=...)
+_RNG = random.Random()
+_NPRNG = np.random.default_rng()
+
 # Helper functions for generating synthetic data
 def generate_random_name() -> tuple:
     """Generate a random first and last name"""
-    first_names = [
-        "James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles",
-        "Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah", "Karen"
-    ]
-    
-    last_names = [
-        "Smith", "Johnson", "Williams", "Jones", "Brown", "Davis", "Miller", "Wilson", "Moore", "Taylor",
-        "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson", "Garcia", "Martinez", "Robinson"
-    ]
-    
-    return random.choice(first_names), random.choice(last_names)
+    return _RNG.choice(_FIRST_NAMES), _RNG.choice(_LAST_NAMES)
 
 def generate_random_date(start_year=1940, end_year=2000) -> str:
     """Generate a random date of birth"""
-    year = random.randint(start_year, end_year)
-    month = random.randint(1, 12)
-    day = random.randint(1, 28)  # Using 28 to avoid invalid dates
+    year = _RNG.randrange(start_year, end_year + 1)
+    month = _RNG.randrange(1, 13)
+    day = _RNG.randrange(1, 29)  # Using 28 to avoid invalid dates
     
     return f"{year}-{month:02d}-{day:02d}"
 
 def generate_random_email(first_name: str, last_name: str) -> str:
     """Generate a random email based on name"""
-    domains = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com"]
-    return f"{first_name.lower()}.{last_name.lower()}@{random.choice(domains)}"
+    return f"{first_name.lower()}.{last_name.lower()}{_RNG.choice(_EMAIL_SUFFIXES)}"
 
 def generate_random_phone() -> str:
     """Generate a random phone number"""
-    return f"{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
+    # One 40-bit draw split by mixed-radix division (900 * 900 * 9000 < 2**40)
+    bits = _RNG.getrandbits(40)
+    bits, a = divmod(bits, 900)
+    bits, b = divmod(bits, 900)
+    c = bits % 9000
+    return f"{100 + a}-{100 + b}-{1000 + c}"
 
 def generate_random_address() -> str:
     """Generate a random address"""
-    street_numbers = list(range(100, 10000))
-    street_names = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill"]
-    street_types = ["St", "Ave", "Blvd", "Rd", "Ln", "Dr", "Way", "Pl", "Ct"]
-    cities = ["Springfield", "Franklin", "Greenville", "Bristol", "Clinton", "Salem", "Madison", "Georgetown", "Arlington"]
-    states = ["CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
-    
-    street_number = random.choice(street_numbers)
-    street_name = random.choice(street_names)
-    street_type = random.choice(street_types)
-    city = random.choice(cities)
-    state = random.choice(states)
-    zip_code = random.randint(10000, 99999)
+    street_number = _RNG.randrange(*_STREET_NUMBER_RANGE)
+    street_phrase = _RNG.choice(_STREET_PHRASES)
+    city_state = _RNG.choice(_CITY_STATES)
+    zip_code = _RNG.randrange(10000, 100000)
     
-    return f"{street_number} {street_name} {street_type}, {city}, {state} {zip_code}"
+    return f"{street_number}{street_phrase}{city_state}{zip_code}"
 
 def generate_random_insurance() -> Dict[str, str]:
     """Generate random insurance information"""
-    carriers = ["Blue Cross", "Aetna", "UnitedHealthcare", "Cigna", "Humana", "Kaiser", "Medicare", "Medicaid"]
+    # One 64-bit draw split by mixed-radix division (8 * 26 * 90000000 * 90000 < 2**64)
+    bits = _RNG.getrandbits(64)
+    bits, carrier_index = divmod(bits, len(_CARRIERS))
+    bits, letter_index = divmod(bits, len(_MEMBER_ID_LETTERS))
+    bits, member_number = divmod(bits, 90000000)
+    group_number = bits % 90000
     
-    carrier = random.choice(carriers)
-    member_id = f"{random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{random.randint(10000000, 99999999)}"
-    group_id = f"G{random.randint(10000, 99999)}"
+    carrier = _CARRIERS[carrier_index]
+    member_id = f"{_MEMBER_ID_LETTERS[letter_index]}{10000000 + member_number}"
+    group_id = f"G{10000 + group_number}"
     
     return {
         "carrier": carrier,
@@ -81,43 +120,64 @@ def generate_random_insurance() -> Dict[str, str]:
         "group_id": group_id
     }
 
-def generate_synthetic_patients(num_patients: int) -> List[Patient]:
-    """Generate a list of synthetic patients"""
-    patients = []
+def _pick(rng: np.random.Generator, pool: tuple, size: int) -> list:
+    """Draw size values from pool with a single vectorized index draw"""
+    return [pool[i] for i in rng.integers(0, len(pool), size).tolist()]
+
+# Dates of birth are drawn uniformly from 1940-01-01 through 2000-12-31
+_BIRTH_DATE_START = np.datetime64("1940-01-01", "D")
+_BIRTH_DATE_SPAN = int((np.datetime64("2000-12-31", "D") - _BIRTH_DATE_START).astype(int))
+
+# Columns the patient generator produces, in database insert order
+_PATIENT_COLUMNS = ("first_name", "last_name", "date_of_birth", "email", "phone", "address")
+
+def generate_synthetic_patient_rows(num_patients: int) -> List[Tuple[str, ...]]:
+    """Generate synthetic patients as field tuples in _PATIENT_COLUMNS order"""
+    rng = _NPRNG
     
-    for _ in range(num_patients):
-        first_name, last_name = generate_random_name()
-        date_of_birth = generate_random_date()
-        email = generate_random_email(first_name, last_name)
-        phone = generate_random_phone()
-        address = generate_random_address()
-        
-        patient = Patient(
-            first_name=first_name,
-            last_name=last_name,
-            date_of_birth=date_of_birth,
-            email=email,
-            phone=phone,
-            address=address
-        )
-        
-        patients.append(patient)
+    # Draw every field for all patients at once, one call per column
+    first_names = _pick(rng, _FIRST_NAMES, num_patients)
+    last_names = _pick(rng, _LAST_NAMES, num_patients)
+    birth_offsets = rng.integers(0, _BIRTH_DATE_SPAN + 1, num_patients).astype("timedelta64[D]")
+    email_suffixes = _pick(rng, _EMAIL_SUFFIXES, num_patients)
+    phone_parts = rng.integers((100, 100, 1000), (1000, 1000, 10000), (num_patients, 3)).tolist()
+    street_numbers = rng.integers(*_STREET_NUMBER_RANGE, num_patients).tolist()
+    street_phrases = _pick(rng, _STREET_PHRASES, num_patients)
+    city_states = _pick(rng, _CITY_STATES, num_patients)
+    zip_codes = rng.integers(10000, 100000, num_patients).tolist()
     
-    return patients
+    # Assemble the string columns from the sampled values
+    return list(zip(
+        first_names,
+        last_names,
+        np.datetime_as_string(_BIRTH_DATE_START + birth_offsets, unit="D").tolist(),
+        [
+            _LOWER_NAMES[first_name] + "." + _LOWER_NAMES[last_name] + suffix
+            for first_name, last_name, suffix in zip(first_names, last_names, email_suffixes)
+        ],
+        [f"{area}-{prefix}-{line}" for area, prefix, line in phone_parts],
+        [
+            f"{number}{street_phrase}{city_state}{zip_code}"
+            for number, street_phrase, city_state, zip_code
+            in zip(street_numbers, street_phrases, city_states, zip_codes)
+        ]
+    ))
+
+def generate_synthetic_patients(num_patients: int) -> List[Patient]:
+    """Generate a list of synthetic patients"""
+    return [
+        Patient(**dict(zip(_PATIENT_COLUMNS, row)))
+        for row in generate_synthetic_patient_rows(num_patients)
+    ]
 
 def generate_synthetic_doctors() -> List[Doctor]:
     """Generate a list of synthetic doctors"""
-    specialties = [
-        "Family Medicine", "Internal Medicine", "Pediatrics", "Cardiology", 
-        "Dermatology", "Neurology", "Orthopedics", "Psychiatry", "Obstetrics"
-    ]
-    
     doctors = []
     
     # Generate 5 doctors with different specialties
     for i in range(5):
         first_name, last_name = generate_random_name()
-        specialty = specialties[i % len(specialties)]
+        specialty = _SPECIALTIES[i % len(_SPECIALTIES)]
         email = f"dr.{last_name.lower()}@clinic.com"
         phone = generate_random_phone()
         
@@ -133,82 +193,102 @@ def generate_synthetic_doctors() -> List[Doctor]:
     
     return doctors
 
-def generate_doctor_schedule(doctor_id: int, start_date: datetime.date, num_days: int) -> None:
-    """Generate a schedule for a doctor for a number of days"""
-    # Working hours: 9 AM to 5 PM
-    working_hours = list(range(9, 17))  # 9 AM to 4 PM (last appointment starts at 4 PM)
+def generate_doctor_schedule(doctor_id: int, start_date: datetime.date, num_days: int) -> List[Tuple[int, str, str]]:
+    """Generate (doctor_id, date, slot) availability rows for a doctor for a number of days"""
+    # Day offsets that fall on a weekday (5 = Saturday, 6 = Sunday are skipped)
+    start_weekday = start_date.weekday()
+    business_days = [day for day in range(num_days) if (start_weekday + day) % 7 < 5]
     
-    for day in range(num_days):
-        current_date = start_date + timedelta(days=day)
-        
-        # Skip weekends
-        if current_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-            continue
+    # 50% chance of availability for each hour, drawn for every business day at once
+    available_hours = _NPRNG.random((len(business_days), len(_WORKING_HOURS))) > 0.5
+    
+    rows = []
+    for row, day in enumerate(business_days):
+        date_str = (start_date + timedelta(days=day)).strftime("%Y-%m-%d")
         
         # Generate available slots
-        available_slots = []
-        for hour in working_hours:
-            # 50% chance of availability for each hour
-            if random.random() > 0.5:
-                available_slots.append(f"{hour:02d}:00")
-                # Add 30-minute slots if it's not the last hour
-                if hour < 16:  # Don't add 4:30 PM
-                    available_slots.append(f"{hour:02d}:30")
-        
-        # Add the available slots to the database
-        if available_slots:
-            add_doctor_availability(doctor_id, current_date.strftime("%Y-%m-%d"), available_slots)
+        for slot_index in (np.flatnonzero(available_hours[row]) * 2).tolist():
+            rows.append((doctor_id, date_str, _SLOT_STRINGS[slot_index]))
+            # Add 30-minute slots if it's not the last hour (no 4:30 PM entry)
+            if slot_index + 1 < len(_SLOT_STRINGS):
+                rows.append((doctor_id, date_str, _SLOT_STRINGS[slot_index + 1]))
+    
+    return rows
 
-def export_patients_to_csv(patients: List[Patient], output_path: str = None) -> str:
-    """Export patients to a CSV file"""
-    if output_path is None:
-        base_dir = Path(__file__).parent.parent.parent
-        output_path = base_dir / 'data' / 'patients.csv'
+# Default export location, resolved once at import
+_BASE_DIR = Path(__file__).resolve().parents[2]
+_DATA_DIR = _BASE_DIR / "data"
+_DEFAULT_PATIENTS_CSV = _DATA_DIR / "patients.csv"
+
+# CSV columns match Patient.to_dict; the getter reads them straight into a row tuple
+_PATIENT_CSV_COLUMNS = field_names(Patient)
+_patient_csv_row = attrgetter(*_PATIENT_CSV_COLUMNS)
+# The CSV columns are id, then _PATIENT_COLUMNS, then the timestamps the database fills in
+_PATIENT_CSV_TIMESTAMPS = (None,) * (len(_PATIENT_CSV_COLUMNS) - len(_PATIENT_COLUMNS) - 1)
+
+def _write_patients_csv(csv_rows, count: int, output_path: str = None) -> str:
+    """Write rows in _PATIENT_CSV_COLUMNS order to the patients CSV file"""
+    output_path = Path(output_path) if output_path else _DEFAULT_PATIENTS_CSV
     
     # Create the directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Convert patients to a list of dictionaries
-    patient_dicts = [patient.to_dict() for patient in patients]
+    # Stream rows straight to the file with the same columns as Patient.to_dict
+    with open(output_path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(_PATIENT_CSV_COLUMNS)
+        writer.writerows(csv_rows)
     
-    # Create a DataFrame and export to CSV
-    df = pd.DataFrame(patient_dicts)
-    df.to_csv(output_path, index=False)
+    logger.info(f"Exported {count} patients to {output_path}")
     
-    logger.info(f"Exported {len(patients)} patients to {output_path}")
-    
-    return output_path
+    return str(output_path)
 
-def generate_synthetic_data(num_patients: int = 50, num_days: int = 30) -> None:
-    """Generate all synthetic data for the application"""
-    # Initialize the database
-    initialize_database()
+def export_patients_to_csv(patients: List[Patient], output_path: str = None) -> str:
+    """Export patients to a CSV file"""
+    return _write_patients_csv(map(_patient_csv_row, patients), len(patients), output_path)
+
+def export_patient_rows_to_csv(patient_ids: List[int], rows: List[Tuple[str, ...]], output_path: str = None) -> str:
+    """Export saved patients, given as IDs and _PATIENT_COLUMNS field tuples, to a CSV file"""
+    csv_rows = ((patient_id, *row, *_PATIENT_CSV_TIMESTAMPS) for patient_id, row in zip(patient_ids, rows))
+    return _write_patients_csv(csv_rows, len(rows), output_path)
+
+def generate_synthetic_data(num_patients: int = 50, num_days: int = 30, seed: Optional[int] = None) -> None:
+    """Generate all synthetic data for the application, reproducibly when seed is given"""
+    global _NPRNG
+    if seed is not None:
+        _RNG.seed(seed)
+        _NPRNG = np.random.default_rng(seed)
     
-    # Generate and save doctors
-    doctors = generate_synthetic_doctors()
-    doctor_ids = []
-    for doctor in doctors:
-        doctor_id = create_doctor(doctor)
-        if doctor_id:
-            doctor_ids.append(doctor_id)
+    # Initialize the database
+    ensure_schema()
     
-    # Generate and save patients
-    patients = generate_synthetic_patients(num_patients)
-    for patient in patients:
-        create_patient(patient)
+    # Save doctors, patients and schedules in one transaction, so seeding never stops half-done
+    with seed_transaction():
+        # Generate and save doctors
+        doctors = generate_synthetic_doctors()
+        doctor_ids = create_doctors_bulk(doctors)
+        
+        # Generate and save patients as field tuples, without building Patient objects
+        patient_rows = generate_synthetic_patient_rows(num_patients)
+        patient_ids = create_patient_rows_bulk(patient_rows)
+        
+        # Generate doctor schedules and save every doctor's availability in one batch
+        start_date = datetime.now().date()
+        availability_rows = []
+        for doctor_id in doctor_ids:
+            availability_rows.extend(generate_doctor_schedule(doctor_id, start_date, num_days))
+        add_doctor_availability_bulk(availability_rows)
     
     # Export patients to CSV
-    export_patients_to_csv(patients)
+    export_patient_rows_to_csv(patient_ids, patient_rows)
     
-    # Generate doctor schedules
-    start_date = datetime.now().date()
-    for doctor_id in doctor_ids:
-        generate_doctor_schedule(doctor_id, start_date, num_days)
+    # Refresh planner statistics now that the tables are populated
+    analyze_database()
     
     # Create sample forms
     create_sample_forms()
     
-    logger.info(f"Generated synthetic data: {len(patients)} patients, {len(doctors)} doctors, {num_days} days of schedules")
+    logger.info(f"Generated synthetic data: {len(patient_ids)} patients, {len(doctors)} doctors, {num_days} days of schedules")
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,163 @@
+import importlib
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from collections import deque
+
+# Point the app at a throwaway database before any src module reads the config
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "test_medical_db.sqlite")
+
+# The agent module needs the LangChain stack; skip rather than fail where it isn't installed
+HAS_LANGCHAIN = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("langchain", "langchain_mistralai")
+)
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is not installed")
+class SchedulingAgentImportTest(unittest.TestCase):
+    def test_module_imports(self):
+        module = importlib.import_module("src.agents.scheduling_agent")
+        self.assertTrue(hasattr(module, "SchedulingAgent"))
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is not installed")
+class DirectBookingTest(unittest.TestCase):
+    def setUp(self):
+        from src.agents.scheduling_agent import SchedulingAgent
+        from src.agents.tools import get_scheduling_tools
+        from src.models.appointment import Doctor
+        from src.utils import database
+        
+        database.ensure_schema()
+        database.create_patient("Jane", "Doe", "1980-04-12", "jane.doe@example.com", "555-123-4567")
+        (self.doctor_id,) = database.create_doctors_bulk([
+            Doctor(first_name="Gregory", last_name="House", specialty="Internal Medicine")
+        ])
+        database.add_doctor_availability(self.doctor_id, "2030-01-07", ["10:00", "10:30"])
+        self.database = database
+        
+        # The direct booking path only uses the tools, so skip building the LLM
+        self.agent = SchedulingAgent.__new__(SchedulingAgent)
+        self.agent.tools_by_name = {tool.name: tool for tool in get_scheduling_tools()}
+        self.agent.messages = deque()
+        self.agent.patient_info = {}
+    
+    def test_slash_dob_is_normalized(self):
+        self.agent._extract_patient_info("My name is Jane Doe and I was born on 04/12/1980")
+        self.assertEqual(self.agent.patient_info["date_of_birth"], "1980-04-12")
+    
+    def test_books_and_confirms_known_patient(self):
+        self.agent._extract_patient_info("My name is Jane Doe and I was born on 04/12/1980")
+        response = self.agent._try_direct_booking(f"Please book doctor {self.doctor_id} on 2030-01-07 at 10:00")
+        self.assertIsNotNone(response)
+        
+        appointment = self.database.get_db_connection().execute(
+            "SELECT status FROM appointments WHERE doctor_id = ? AND appointment_date = ? AND appointment_time = ?",
+            (self.doctor_id, "2030-01-07", "10:00")
+        ).fetchone()
+        self.assertEqual(appointment["status"], "confirmed")
+    
+    def test_non_booking_messages_fall_back_to_agent(self):
+        self.agent._extract_patient_info("My name is Jane Doe and I was born on 04/12/1980")
+        for message in (
+            f"Is doctor {self.doctor_id} free on 2030-01-07 at 10:00?",
+            f"Cancel my appointment with doctor {self.doctor_id} on 2030-01-07 10:00",
+            f"Please reschedule doctor {self.doctor_id} on 2030-01-07 at 10:00",
+            f"I have doctor {self.doctor_id} on 2030-01-07 at 10:00"
+        ):
+            self.assertIsNone(self.agent._try_direct_booking(message))
+        
+        appointments = self.database.get_db_connection().execute(
+            "SELECT COUNT(*) AS count FROM appointments WHERE doctor_id = ?", (self.doctor_id,)
+        ).fetchone()
+        self.assertEqual(appointments["count"], 0)
+    
+    def test_unknown_patient_falls_back_to_agent(self):
+        self.agent._extract_patient_info("My name is John Roe and I was born on 1975-02-03")
+        self.assertIsNone(
+            self.agent._try_direct_booking(f"Please book doctor {self.doctor_id} on 2030-01-07 at 10:30")
+        )
+
+class _FakeExecutor:
+    """Stands in for the AgentExecutor, replaying callback events and then returning or raising"""
+    
+    def __init__(self, events, output=None, error=None):
+        self.events = events
+        self.output = output
+        self.error = error
+    
+    def invoke(self, inputs, config):
+        handler = config["callbacks"][0]
+        for event, value in self.events:
+            getattr(handler, event)(value)
+        if self.error:
+            raise self.error
+        return {"output": self.output}
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is not installed")
+class MessageStreamTest(unittest.TestCase):
+    def setUp(self):
+        from src.agents.scheduling_agent import SchedulingAgent
+        
+        self.agent = SchedulingAgent.__new__(SchedulingAgent)
+        self.agent.messages = deque()
+        self.agent.patient_info = {}
+    
+    def _shown(self, chunks):
+        from src.agents.scheduling_agent import StreamReplacement
+        
+        text = ""
+        for chunk in chunks:
+            text = str(chunk) if isinstance(chunk, StreamReplacement) else text + chunk
+        return text
+    
+    def test_only_the_final_answer_is_shown(self):
+        self.agent.agent_executor = _FakeExecutor(
+            [
+                ("on_llm_new_token", "Let me look that up for you. "),
+                ("on_agent_action", None),
+                ("on_llm_new_token", "Dr. Smith has openings "),
+                ("on_llm_new_token", "on Monday.")
+            ],
+            output="Dr. Smith has openings on Monday."
+        )
+        shown = self._shown(self.agent.process_message_stream("Which doctors have openings this week, part one?"))
+        self.assertEqual(shown, "Dr. Smith has openings on Monday.")
+        self.assertEqual(self.agent.messages[-1].content, shown)
+    
+    def test_error_replaces_partial_output(self):
+        from src.agents.scheduling_agent import ERROR_RESPONSE
+        
+        self.agent.agent_executor = _FakeExecutor(
+            [("on_llm_new_token", "Dr. Smith has openings on")],
+            error=RuntimeError("connection dropped")
+        )
+        shown = self._shown(self.agent.process_message_stream("Which doctors have openings this week, part two?"))
+        self.assertEqual(shown, ERROR_RESPONSE)
+        self.assertEqual(len(self.agent.messages), 0)
+
+@unittest.skipUnless(HAS_LANGCHAIN, "langchain is not installed")
+class PatientRegistrationToolTest(unittest.TestCase):
+    def setUp(self):
+        from src.agents.tools import get_scheduling_tools
+        from src.utils import database
+        
+        database.ensure_schema()
+        self.tool = {tool.name: tool for tool in get_scheduling_tools()}["patient_registration"]
+        self.database = database
+    
+    def test_registers_new_patient(self):
+        result = json.loads(self.tool._run("Ada", "Lovelace", "1985-12-10", "ada@example.com", "555-987-6543"))
+        self.assertTrue(result["success"])
+        
+        patient = self.database.get_patient_by_id(result["patient"]["id"])
+        self.assertEqual((patient["first_name"], patient["email"]), ("Ada", "ada@example.com"))
+    
+    def test_rejects_existing_patient(self):
+        self.tool._run("Alan", "Turing", "1982-06-23", "alan@example.com", "555-222-3333")
+        result = json.loads(self.tool._run("Alan", "Turing", "1982-06-23", "alan@example.com", "555-222-3333"))
+        self.assertFalse(result["success"])
+
+if __name__ == "__main__":
+    unittest.main()